@@ -1,6 +1,8 @@
 import uuid
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form, BackgroundTasks
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from app.domain.exceptions import CapacityExceededError, ValidationError
 from app.domain.proactiva.services.document_service import DocumentService
 from app.domain.proactiva.services.knowledge_service import KnowledgeService
 from app.api.proactiva.endpoints.knowledge import get_knowledge_service
@@ -42,9 +44,85 @@ async def upload_file(
     return upload_result
 
 
+@router.post("/upload/batch")
+async def upload_batch(
+    files: List[UploadFile] = File(...),
+    knowledge_base_id: Optional[str] = Form(None),
+    current_user: User = Depends(deps.get_current_user),
+    kb_service: KnowledgeService = Depends(get_knowledge_service),
+):
+    """Sube varios archivos (o archivos .zip) y los encola en el pool de ingestión."""
+    try:
+        results = await document_service.upload_batch(
+            files, user_id=str(current_user.id), knowledge_base_id=knowledge_base_id
+        )
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if knowledge_base_id:
+        for result in results:
+            await kb_service.add_document_to_kb(
+                kb_id=uuid.UUID(knowledge_base_id),
+                user_id=current_user.id,
+                file_id=result["file_id"],
+                filename=result["filename"],
+            )
+
+    return {"queued": len(results), "documents": results}
+
+
+@router.put("/{doc_id}")
+async def update_file(
+    doc_id: str,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    knowledge_base_id: Optional[str] = Form(None),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """Sube una nueva revisión de un documento y re-indexa solo los fragmentos modificados."""
+    allowed_extensions = {".pdf", ".doc", ".docx", ".json"}
+    filename = file.filename.lower() if file.filename else ""
+    if not any(filename.endswith(ext) for ext in allowed_extensions):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file format. Only .pdf, .doc, .docx, and .json files are supported.",
+        )
+
+    result = await document_service.update_document(
+        doc_id,
+        file,
+        user_id=str(current_user.id),
+        knowledge_base_id=knowledge_base_id,
+        background_tasks=background_tasks,
+    )
+    if result is None:
+        raise HTTPException(status_code=404, detail="Document not found or access denied")
+    return result
+
+
 @router.get("/status/{task_id}")
-async def status(task_id: str):
-    return document_service.get_task_status(task_id)
+async def status(
+    task_id: str,
+    current_user: User = Depends(deps.get_current_user),
+):
+    user_id = None if current_user.is_superuser else str(current_user.id)
+    result = await document_service.get_task_status(task_id, user_id=user_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Task not found or access denied")
+    return result
+
+
+@router.get("/jobs")
+async def list_jobs(
+    active_only: bool = False,
+    limit: int = 100,
+    current_user: User = Depends(deps.get_current_user),
+):
+    """Lista los trabajos de ingestión (activos, en cola y recientes) con progreso y ETA."""
+    user_id = None if current_user.is_superuser else str(current_user.id)
+    return await document_service.list_jobs(user_id=user_id, active_only=active_only, limit=limit)
 
 
 @router.get("/{doc_id}")
@@ -52,11 +130,11 @@ async def get_document_details(
     doc_id: str,
     current_user: User = Depends(deps.get_current_user),
 ):
-    """Recupera los detalles de un documento procesado."""
-    details = await document_service.get_document_details(doc_id, user_id=str(current_user.id))
-    if not details:
+    """Recupera los detalles de un documento procesado (JSON transmitido por fragmentos)."""
+    body = await document_service.stream_document_details(doc_id, user_id=str(current_user.id))
+    if body is None:
         raise HTTPException(status_code=404, detail="Document not found or access denied")
-    return details
+    return StreamingResponse(body, media_type="application/json")
 
 
 @router.delete("/{doc_id}")
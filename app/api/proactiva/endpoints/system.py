@@ -4,6 +4,8 @@ from sqlalchemy import func
 from sqlmodel import select
 
 from app.persistence.db import get_session
+from app.domain.shared.ingestion.embedder import get_query_cache
+from app.domain.shared.retrieval.result_cache import get_search_cache
 from app.domain.shared.schemas.user import User
 from app.domain.proactiva.schemas.conversation import Conversation
 
@@ -22,9 +24,14 @@ async def get_system_stats(session: AsyncSession = Depends(get_session)):
     user_result = await session.execute(user_count_stmt)
     conv_result = await session.execute(conv_count_stmt)
     
+    search_cache = get_search_cache()
     return {
         "active_users": user_result.scalar() or 0,
         "total_conversations": conv_result.scalar() or 0,
+        "caches": {
+            "query_vectors": get_query_cache().stats(),
+            "search_results": search_cache.stats() if search_cache else None,
+        },
         "status": "nominal"
     }
 
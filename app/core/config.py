@@ -8,9 +8,29 @@ class Settings(BaseSettings):
     qdrant_host: str 
     qdrant_port: int 
     qdrant_collection: str = "documents"
+    qdrant_prefer_grpc: bool = False  # gRPC (protobuf, ~5x smaller upserts) instead of REST for every Qdrant call
+    qdrant_grpc_port: int = 6334
+    qdrant_payload_indexes: bool = True      # Keyword indexes on the filtered metadata fields (created / migrated on first use)
+    qdrant_tenant_partitioning: bool = False  # Tenant field indexed with is_tenant + per-tenant HNSW (payload_m) instead of a global graph
+    qdrant_collection_profile: str = "memory"  # memory (float32 in RAM) | int8 | binary (quantized in RAM, originals on disk, rescoring) | disk
+    qdrant_sparse_on_disk: bool = False       # Sparse (SPLADE) index on disk whatever the profile
     embedding_model: str = "nomic-ai/nomic-embed-text-v1.5"
     sparse_embedding_model: str = "prithivida/Splade_PP_en_v1"
     reranker_model: str = "BAAI/bge-reranker-v2-m3"
+    model_warmup: bool = False  # Load embedding + reranker models at startup instead of on the first request
+    reranker_backend: str = "torch"        # torch (sentence-transformers fp32) | onnx (fp32) | onnx-int8 (dynamic int8)
+    reranker_onnx_dir: str = "models/bge-reranker-v2-m3-onnx"  # Output of scripts/export_reranker_onnx.py
+    reranker_max_length: int = 512         # ONNX backends: tokens per [query, passage] pair (torch keeps the model's limit)
+    reranker_truncation: str = "only_second"  # ONNX backends: only_second keeps the query whole | longest_first
+    reranker_onnx_threads: int = 0         # ONNX Runtime intra-op threads (0 = all cores)
+    rerank_adaptive: bool = False          # Score candidates in RRF order in batches and stop early
+    rerank_batch_size: int = 8             # Adaptive mode: pairs cross-encoded per step
+    rerank_margin: float = 0.15            # Adaptive mode: stop when a batch's best is this far below the k-th score (probabilities: every backend applies a sigmoid)
+
+    # Retrieval — search result cache (in-process TTL + LRU, invalidated by ingestion / deletion)
+    search_cache_enabled: bool = True
+    search_cache_ttl_seconds: float = 300.0
+    search_cache_max_entries: int = 2048
     
     
     # MinIO 1.0
@@ -19,6 +39,9 @@ class Settings(BaseSettings):
     minio_secret_key: str
     minio_bucket: str 
     minio_secure: bool 
+    minio_part_size: int = 16 * 1024 * 1024   # Multipart part size for uploads / ranged downloads (min 5 MiB)
+    minio_max_connections: int = 16           # Shared HTTP pool size (and blob I/O threads)
+    minio_parallel_transfers: int = 4         # Parts transferred concurrently per object
     
     # Postgres
     postgres_user: str = "postgres"
@@ -94,6 +117,37 @@ class Settings(BaseSettings):
     ner_max_concurrency: int = 3     # Max parallel batch requests to the LLM
     ner_retry_max_attempts: int = 5  # Max retries on rate-limit (429) errors
 
+    # Ingestion Pipeline — PDF extraction
+    pdf_extract_workers: int = 4     # Worker processes parsing PDF page ranges in parallel
+    pdf_pages_per_task: int = 8      # Pages parsed per worker task
+    pdf_table_min_rules: int = 4     # Horizontal rules on a page before pdfplumber table extraction runs (0 = never)
+
+    # Ingestion Pipeline — streaming windows (peak memory ~ window_size * queue_depth chunks)
+    ingestion_window_size: int = 64  # Chunks embedded and upserted together
+    ingestion_queue_depth: int = 2   # Windows buffered between consecutive stages
+    qdrant_upsert_batch_points: int = 256          # Max points per upsert request
+    qdrant_upsert_max_bytes: int = 4 * 1024 * 1024  # Max estimated request size (gRPC default message limit is 4 MB)
+    qdrant_upsert_parallelism: int = 4             # Upsert requests in flight per ingestion (wait=False + final barrier)
+    embedding_batch_size: int = 32   # Texts per fastembed micro-batch (dense and sparse)
+
+    # Ingestion Pipeline — content-addressed embedding cache (SQLite, LRU-bounded)
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str = "data/embedding_cache.sqlite"
+    embedding_cache_max_entries: int = 200_000  # ~3 KB dense + sparse per entry
+    query_embedding_cache_size: int = 1024      # In-memory LRU of query vectors (0 = disabled)
+
+    # Ingestion Pipeline — worker pool (bulk uploads)
+    ingestion_max_concurrency: int = 2   # Documents ingested at the same time per process
+    ingestion_max_queued: int = 10_000   # Jobs waiting across all tenants before uploads are rejected
+    ingestion_zip_max_members: int = 1000              # Supported files extracted per zip archive
+    ingestion_zip_max_bytes: int = 2 * 1024 * 1024 * 1024  # Uncompressed bytes extracted per zip archive
+
+    # Inference server (optional) — embedding + rerank in a separate process with dynamic batching
+    inference_server_url: Optional[str] = None  # e.g. "http://127.0.0.1:8765" or "unix:///tmp/aura-inference.sock"; None = in-process models
+    inference_max_batch: int = 64        # Texts / pairs coalesced into one model call across callers
+    inference_max_wait_ms: float = 5.0   # How long a batch waits for more requests before running
+    inference_timeout: float = 120.0     # Client request timeout (seconds)
+
     # ── Reactive Domain — isolated namespaces (same infra containers) ─────
     reactive_qdrant_collection: str = "reactive_documents"
     reactive_minio_bucket: str = "reactive-bucket"
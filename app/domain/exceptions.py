@@ -35,3 +35,10 @@ class ValidationError(DomainError):
 
     def __init__(self, detail: str):
         super().__init__(detail)
+
+
+class CapacityExceededError(DomainError):
+    """Raised when a bounded queue or pool cannot accept more work."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
@@ -30,7 +30,7 @@ from app.domain.proactiva.agent.prompts import INDUSTRIAL_SYSTEM_PROMPT
 
 from app.domain.proactiva.agent.memory import create_composite_backend
 
-from app.domain.proactiva.agent.tools.knowledge_tool import ask_knowledge_agent
+from app.domain.proactiva.agent.tools.knowledge_tool import ask_knowledge_agent, ask_knowledge_agent_many
 
 from app.domain.proactiva.agent.tools.mcp_tool import call_dynamic_mcp
 
@@ -122,6 +122,8 @@ def create_industrial_agent(
 
         active_tools.append(ask_knowledge_agent)
 
+        active_tools.append(ask_knowledge_agent_many)
+
     if enable_mcp:
 
         active_tools.append(call_dynamic_mcp)
@@ -1,7 +1,6 @@
-import asyncio
-from app.domain.shared.ingestion.embedder import Embedder
+from app.domain.shared.inference import make_embedder, make_reranker
+from app.domain.shared.retrieval.result_cache import get_search_cache
 from app.persistence.vector import QdrantManager
-from app.domain.shared.retrieval.reranker import Reranker
 from qdrant_client.http import models as qmodels
 from qdrant_client.http.models import Filter, FieldCondition, MatchValue
 from typing import Optional, Any
@@ -9,9 +8,9 @@ from loguru import logger
 
 class SemanticSearcher:
     def __init__(self):
-        self.embedder = Embedder()
+        self.embedder = make_embedder()
         self.vector_store = QdrantManager()
-        self.reranker = Reranker()
+        self.reranker = make_reranker()
 
     async def search(
         self, 
@@ -22,25 +21,142 @@ class SemanticSearcher:
         session: Optional[Any] = None,
         min_score: Optional[float] = None,
     ):
-        # Fetch dynamic settings once
-        final_limit = 5
-        if session:
-            from app.persistence.shared.settings_repository import SettingsRepository
-            repo = SettingsRepository(session)
-            system_settings = await repo.get_settings()
-            if limit is None:
-                final_limit = system_settings.retrieval_search_results
-        if limit is not None:
-            final_limit = limit
+        final_limit = await self._resolve_limit(limit, session)
+
+        # 0. Result cache — a hit skips embedding, Qdrant and reranking
+        cache = get_search_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.key(self.vector_store.collection_name, query, user_id, knowledge_base_id, final_limit)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"[Searcher] Cache hit ({len(cached)} results, hit rate {cache.hit_rate:.0%})")
+                return cached
 
         # 1. Embed Query en PARALELO (Dense + Sparse son operaciones independientes)
-        # asyncio.gather los lanza simultaneamente → ~30% menos latencia en el paso de embedding
-        query_dense, query_sparse = await asyncio.gather(
-            self.embedder.embed_query(query),
-            self.embedder.embed_sparse_query(query),
-        )
+        # embed_hybrid_query los lanza simultaneamente y memoiza los vectores por texto
+        query_dense, query_sparse = await self.embedder.embed_hybrid_query(query)
 
         # 2. Build Filter
+        filter_dict = self._build_filter(user_id, knowledge_base_id)
+
+        # 3. Hybrid Search with RRF (Initial Retrieval)
+        # Fetch a pool of candidates (4x final_limit) to be refined by the Reranker.
+        # NOTE: RRF fusion scores are rank-based (sum of 1/(k+rank)), not cosine similarity.
+        # A min_score threshold does not apply here; the Reranker handles quality filtering.
+        candidates_pool_size = max(20, final_limit * 4)
+
+        prefetch_list = self._prefetch(query_dense, query_sparse, candidates_pool_size)
+        fusion_query = qmodels.FusionQuery(fusion=qmodels.Fusion.RRF)
+
+        logger.debug(f"[Searcher] Executing hybrid query (RRF) for: {query[:50]}...")
+        hits = await self.vector_store.search(
+            query=fusion_query,
+            prefetch=prefetch_list,
+            limit=candidates_pool_size,
+            filter_dict=filter_dict
+        )
+
+        if not hits:
+            logger.warning("[Searcher] No results found in hybrid retrieval.")
+            return []
+
+        # 4. Format candidates for Reranking
+        candidates = self._candidates(hits)
+
+        # 5. Rerank (Final refinement stage)
+        # The reranker will select the best `final_limit` results out of the `candidates`
+        results = await self.reranker.rerank(query, candidates, top_k=final_limit)
+
+        if cache_key is not None:
+            cache.put(cache_key, results)
+        logger.info(f"[Searcher] Final results after hybrid + rerank: {len(results)}")
+        return results
+
+    async def search_many(
+        self,
+        queries: list[str],
+        user_id: str,
+        limit: Optional[int] = None,
+        knowledge_base_id: Optional[str] = None,
+        session: Optional[Any] = None,
+    ) -> list[list[dict]]:
+        """
+        Hybrid search + rerank for several queries at roughly the cost of one:
+        one batched embedding pass, one `query_batch_points` request and one
+        cross-encoder call over every (query, candidate) pair.
+
+        Returns one result list per query, in input order.
+        """
+        if not queries:
+            return []
+        final_limit = await self._resolve_limit(limit, session)
+
+        # 0. Result cache per query — only the misses go through the pipeline
+        results: list[Optional[list[dict]]] = [None] * len(queries)
+        cache = get_search_cache()
+        cache_keys = {}
+        pending = []
+        for i, query in enumerate(queries):
+            if cache is not None:
+                cache_keys[i] = cache.key(self.vector_store.collection_name, query, user_id, knowledge_base_id, final_limit)
+                cached = cache.get(cache_keys[i])
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            pending.append(i)
+
+        if pending:
+            texts = [queries[i] for i in pending]
+
+            # 1. Embed all queries (one batch per model)
+            dense_vectors, sparse_vectors = await self.embedder.embed_hybrid_queries(texts)
+
+            # 2-3. One batched hybrid RRF request, same shape as `search`
+            filter_dict = self._build_filter(user_id, knowledge_base_id)
+            candidates_pool_size = max(20, final_limit * 4)
+            requests = [
+                qmodels.QueryRequest(
+                    prefetch=self._prefetch(dense, sparse, candidates_pool_size),
+                    query=qmodels.FusionQuery(fusion=qmodels.Fusion.RRF),
+                    filter=filter_dict,
+                    limit=candidates_pool_size,
+                    offset=0,  # explicit: local-mode Qdrant does not default it in batch requests
+                    with_payload=True,
+                )
+                for dense, sparse in zip(dense_vectors, sparse_vectors)
+            ]
+            logger.debug(f"[Searcher] Executing batched hybrid query (RRF) for {len(texts)} queries")
+            hits_per_query = await self.vector_store.search_batch(requests)
+
+            # 4-5. Rerank every (query, candidate) pair in one cross-encoder call
+            candidate_lists = [self._candidates(hits) for hits in hits_per_query]
+            reranked = await self.reranker.rerank_many(texts, candidate_lists, top_k=final_limit)
+
+            for i, query_results in zip(pending, reranked):
+                results[i] = query_results
+                if i in cache_keys:
+                    cache.put(cache_keys[i], query_results)
+
+        logger.info(
+            f"[Searcher] Batched search: {len(queries)} queries "
+            f"({len(queries) - len(pending)} from cache), "
+            f"{sum(len(r) for r in results)} results"
+        )
+        return results
+
+    async def _resolve_limit(self, limit: Optional[int], session: Optional[Any]) -> int:
+        """Explicit `limit`, else the system setting (when a session is given), else 5."""
+        if limit is not None:
+            return limit
+        if session:
+            from app.persistence.shared.settings_repository import SettingsRepository
+            system_settings = await SettingsRepository(session).get_settings()
+            return system_settings.retrieval_search_results
+        return 5
+
+    @staticmethod
+    def _build_filter(user_id: str, knowledge_base_id: Optional[str]) -> Filter:
         conditions = [
             FieldCondition(
                 key="metadata.user_id",
@@ -54,16 +170,11 @@ class SemanticSearcher:
                     match=MatchValue(value=knowledge_base_id)
                 )
             )
-        filter_dict = Filter(must=conditions) if conditions else None
-
-        # 3. Hybrid Search with RRF (Initial Retrieval)
-        # Fetch a pool of candidates (4x final_limit) to be refined by the Reranker.
-        # NOTE: RRF fusion scores are rank-based (sum of 1/(k+rank)), not cosine similarity.
-        # A min_score threshold does not apply here; the Reranker handles quality filtering.
-        candidates_pool_size = max(20, final_limit * 4)
+        return Filter(must=conditions)
 
+    def _prefetch(self, query_dense, query_sparse, pool_size: int) -> list:
         # prefetch is a top-level query_points argument — FusionQuery only takes fusion=
-        prefetch_list = [
+        return [
             # Branch 1: Sparse (Keyword importance via SPLADE)
             qmodels.Prefetch(
                 query=qmodels.SparseVector(
@@ -71,31 +182,21 @@ class SemanticSearcher:
                     values=query_sparse.values.tolist()
                 ),
                 using="sparse",
-                limit=candidates_pool_size
+                limit=pool_size
             ),
             # Branch 2: Dense (Semantic context)
             qmodels.Prefetch(
                 query=query_dense,
                 using="dense",
-                limit=candidates_pool_size
+                limit=pool_size,
+                params=self.vector_store.dense_search_params()
             ),
         ]
-        fusion_query = qmodels.FusionQuery(fusion=qmodels.Fusion.RRF)
 
-        logger.debug(f"[Searcher] Executing hybrid query (RRF) for: {query[:50]}...")
-        hits = await self.vector_store.search(
-            query=fusion_query,
-            prefetch=prefetch_list,
-            limit=candidates_pool_size,
-            filter_dict=filter_dict
-        )
-
-        if not hits:
-            logger.warning("[Searcher] No results found in hybrid retrieval.")
-            return []
-
-        # 4. Format candidates for Reranking
-        candidates = [
+    @staticmethod
+    def _candidates(hits) -> list[dict]:
+        """Qdrant points -> reranker candidates (text, first-stage score, metadata)."""
+        return [
             {
                 "text": hit.payload["text"],
                 "score": float(hit.score),
@@ -107,10 +208,3 @@ class SemanticSearcher:
             }
             for hit in hits
         ]
-
-        # 5. Rerank (Final refinement stage)
-        # The reranker will select the best `final_limit` results out of the `candidates`
-        results = await self.reranker.rerank(query, candidates, top_k=final_limit)
-
-        logger.info(f"[Searcher] Final results after hybrid + rerank: {len(results)}")
-        return results
\ No newline at end of file
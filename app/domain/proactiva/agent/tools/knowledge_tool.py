@@ -16,6 +16,37 @@ def set_searcher(searcher: SemanticSearcher) -> None:
     _searcher_instance = searcher
 
 
+def _format_results(results: list[dict]) -> list[str]:
+    formatted_docs = []
+    for res in results:
+        source = res["metadata"].get("source", "unknown")
+        section = res["metadata"].get("section", "")
+        text = res["text"]
+        score = res["score"]
+        section_str = f" › {section}" if section and section != "No section" else ""
+        # Trim excessively long chunks to save tokens (max ~800 chars)
+        if len(text) > 800:
+            text = text[:800] + "…"
+        formatted_docs.append(
+            f"--- [{source}{section_str}] (relevancia: {score:.0%}) ---\n{text}\n"
+        )
+    return formatted_docs
+
+
+def _check_scope(user_id, knowledge_base_id) -> str | None:
+    """Error message for the agent when the search scope is missing, else None."""
+    if not user_id:
+        return "Error: No user_id found in the config. Cannot search."
+
+    if not knowledge_base_id:
+        return (
+            "Error: No hay ninguna base de conocimientos (Knowledge Base) seleccionada en este chat. "
+            "No puedes buscar documentos porque el usuario seleccionó 'Sin Contexto'. "
+            "Indícale al usuario que debe seleccionar una colección de documentos para poder buscar información."
+        )
+    return None
+
+
 @tool
 async def ask_knowledge_agent(
     config: RunnableConfig,
@@ -49,15 +80,9 @@ async def ask_knowledge_agent(
         f"user_id={user_id}, kb_id={knowledge_base_id}"
     )
 
-    if not user_id:
-        return "Error: No user_id found in the config. Cannot search."
-
-    if not knowledge_base_id:
-        return (
-            "Error: No hay ninguna base de conocimientos (Knowledge Base) seleccionada en este chat. "
-            "No puedes buscar documentos porque el usuario seleccionó 'Sin Contexto'. "
-            "Indícale al usuario que debe seleccionar una colección de documentos para poder buscar información."
-        )
+    error = _check_scope(user_id, knowledge_base_id)
+    if error:
+        return error
 
     searcher = get_searcher()
     # Now it dynamically reads limit from SystemSettings if session is present
@@ -68,19 +93,7 @@ async def ask_knowledge_agent(
         session=session
     )
 
-    formatted_docs = []
-    for res in results:
-        source = res["metadata"].get("source", "unknown")
-        section = res["metadata"].get("section", "")
-        text = res["text"]
-        score = res["score"]
-        section_str = f" › {section}" if section and section != "No section" else ""
-        # Trim excessively long chunks to save tokens (max ~800 chars)
-        if len(text) > 800:
-            text = text[:800] + "…"
-        formatted_docs.append(
-            f"--- [{source}{section_str}] (relevancia: {score:.0%}) ---\n{text}\n"
-        )
+    formatted_docs = _format_results(results)
 
     if not formatted_docs:
         return (
@@ -90,3 +103,58 @@ async def ask_knowledge_agent(
 
     logger.info(f"[Knowledge Tool] Found {len(formatted_docs)} results")
     return "\n".join(formatted_docs)
+
+
+@tool
+async def ask_knowledge_agent_many(
+    config: RunnableConfig,
+    queries: list[str] | None = None,
+    **kwargs,
+) -> str:
+    """
+    Search the user's Knowledge Base for SEVERAL questions in a single call.
+    Use this instead of calling ask_knowledge_agent repeatedly when the request needs
+    information on more than one topic (e.g. a procedure AND its regulation AND an incident).
+    Input is a list of clear, independent search queries (max 8); results are grouped per query.
+    """
+    # Same nested-"parameters" hallucination handling as ask_knowledge_agent
+    if not queries:
+        parameters = kwargs.get("parameters") or kwargs.get("args") or {}
+        queries = parameters.get("queries") or []
+    if isinstance(queries, str):
+        queries = [queries]
+    queries = [q.strip() for q in queries if q and q.strip()][:8]
+
+    if not queries:
+        return "Error: No queries provided. Please provide a list of search queries."
+
+    configurable = config.get("configurable", {})
+    user_id = configurable.get("user_id")
+    knowledge_base_id = configurable.get("knowledge_base_id")
+    session = configurable.get("session")
+
+    logger.info(
+        f"[Knowledge Tool] Batch searching {len(queries)} queries, "
+        f"user_id={user_id}, kb_id={knowledge_base_id}"
+    )
+
+    error = _check_scope(user_id, knowledge_base_id)
+    if error:
+        return error
+
+    searcher = get_searcher()
+    results_per_query = await searcher.search_many(
+        queries,
+        user_id=user_id,
+        knowledge_base_id=knowledge_base_id,
+        session=session
+    )
+
+    sections = []
+    for query, results in zip(queries, results_per_query):
+        formatted_docs = _format_results(results)
+        body = "\n".join(formatted_docs) if formatted_docs else "No se encontraron documentos relevantes para esta consulta.\n"
+        sections.append(f"=== Consulta: {query} ===\n{body}")
+
+    logger.info(f"[Knowledge Tool] Found {sum(len(r) for r in results_per_query)} results for {len(queries)} queries")
+    return "\n".join(sections)
@@ -4,22 +4,26 @@ Document ingestion pipeline.
 Orchestrates the full document processing flow:
   Load ? Classify ? Split ? NER (batched + concurrent) ? Embed ? Store
 
+Stages run concurrently over fixed-size chunk windows (see WindowedIngestion),
+so memory is bounded by the window size rather than the document size.
+
 Dependencies are injected for testability (DIP).
 """
 
 import uuid
 from typing import Optional, Any
 
-from qdrant_client.http import models as qmodels
-from qdrant_client.http.models import PointStruct
 from pathlib import Path
 from langchain_core.documents import Document
 from loguru import logger
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from app.domain.shared.ingestion.document_loader import DocumentLoader
 from app.domain.shared.ingestion.text_splitter import HierarchicalSplitter
 from app.domain.shared.ingestion.embedder import Embedder
+from app.domain.shared.inference import make_embedder
+from app.domain.shared.retrieval.result_cache import invalidate_search_cache
+from app.domain.shared.ingestion.streaming import WindowedIngestion
+from app.domain.proactiva.ingestion.progress import JobProgress
 from app.persistence.vector import QdrantManager
 
 
@@ -39,7 +43,7 @@ class DocumentProcessor:
     ):
         self.loader = loader or DocumentLoader()
         self.splitter = splitter or HierarchicalSplitter()
-        self.embedder = embedder or Embedder()
+        self.embedder = embedder or make_embedder()
         self.vector_store = vector_store or QdrantManager()
 
     async def process_file(
@@ -49,10 +53,21 @@ class DocumentProcessor:
         doc_id: Optional[str] = None,
         knowledge_base_id: Optional[str] = None,
         session: Optional[Any] = None,
+        update: bool = False,
+        progress: Optional[JobProgress] = None,
     ) -> dict:
-        """Process a single file through the entire pipeline."""
+        """Process a single file through the entire pipeline.
+
+        With `update=True` the file is a new revision of `doc_id`: chunks whose hash
+        is already stored keep their points, only new/changed chunks are embedded
+        and upserted, and chunks that vanished from the document are deleted. If the
+        update fails, the points it added are removed and the stored chunks get their
+        previous metadata back. `progress`, if given, is updated as each stage advances.
+        """
+        if update and not doc_id:
+            raise ValueError("doc_id is required to update a document")
         doc_id = doc_id or str(uuid.uuid4()) # Generate doc_id early for metadata
-        logger.info(f"Processing document: {file_path} for user: {user_id}")
+        logger.info(f"{'Updating' if update else 'Processing'} document: {file_path} for user: {user_id}")
 
         # 1. Fetch dynamic settings
         chunk_size = 1000
@@ -64,75 +79,86 @@ class DocumentProcessor:
             chunk_size = system_settings.document_chunk_size
             chunk_overlap = system_settings.document_chunk_overlap
 
-        # 2. Extract Text
-        docs = self.loader.load(file_path)
-        for doc in docs:
-            doc.metadata["doc_id"] = doc_id # Ensure doc_id is set for initial docs
-
         doc_category = "document" # Default category since we removed classification
         logger.info(f"Document category set to default: {doc_category}")
 
-        # 3. Split  Two-stage: Hierarchical (section detection) ? Recursive (size enforcement)
-        # Stage 1: the HierarchicalSplitter adds section metadata to each chunk
-        hierarchical_chunks = self.splitter.split_documents(docs)
+        # 2-5. Load → Split → Embed → Store, streamed in fixed-size windows.
+        # Split is single-pass: section detection and chunk_size enforcement in one scan
 
-        # Stage 2: enforce chunk_size limits using RecursiveCharacterTextSplitter
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-        )
-        split_chunks = text_splitter.split_documents(hierarchical_chunks)
-        chunks = []
-        for i, split_doc in enumerate(split_chunks):
-            new_metadata = {
+        def split_page(doc: Document) -> list[Document]:
+            doc.metadata["doc_id"] = doc_id # Ensure doc_id is set for initial docs
+            if progress and progress.total_pages is None:
+                progress.total_pages = doc.metadata.get("total_pages", 1)
+            return self.splitter.split_documents([doc], chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+        def build_metadata(split_doc: Document, chunk_index: int) -> dict:
+            return {
                 "doc_id": doc_id,
                 "user_id": user_id,
-                "chunk_index": i,
+                "chunk_index": chunk_index,
                 "knowledge_base_id": knowledge_base_id,
                 "doc_category": doc_category,
                 "section": split_doc.metadata.get("section", "No section"),
-                **{k: v for k, v in split_doc.metadata.items() if k not in ("doc_id", "user_id", "chunk_index", "knowledge_base_id", "doc_category")},
+                **{k: v for k, v in split_doc.metadata.items() if k not in ("doc_id", "user_id", "chunk_index", "knowledge_base_id", "doc_category", "extract_ms")},
             }
-            chunks.append(Document(page_content=split_doc.page_content, metadata=new_metadata))
-
-        total_chunks = len(chunks)
-        logger.info(f"Document split into {total_chunks} chunks")
-
-        # 4. Embed (Dual: Dense + Sparse SPLADE)
-        texts = [chunk.page_content for chunk in chunks]
-        dense_vectors = await self.embedder.embed_documents(texts)
-        sparse_vectors = await self.embedder.embed_sparse_documents(texts)
-
-        # 5. Store
-        points = []
-        for i, (chunk, d_vec, s_vec) in enumerate(zip(chunks, dense_vectors, sparse_vectors)):
-            points.append(
-                PointStruct(
-                    id=str(uuid.uuid4()),
-                    vector={
-                        "dense": d_vec,
-                        "sparse": qmodels.SparseVector(
-                            indices=s_vec.indices.tolist(),
-                            values=s_vec.values.tolist()
-                        )
-                    },
-                    payload={
-                        "text": chunk.page_content,
-                        "metadata": {
-                            **chunk.metadata,
-                            "doc_id": doc_id,
-                            "user_id": user_id,
-                            "chunk_index": i,
-                            "knowledge_base_id": knowledge_base_id,
-                        },
-                    },
+
+        existing = None
+        previous: list[tuple[str, dict]] = []
+        if update:
+            existing = await self.vector_store.get_document_chunk_hashes(doc_id, user_id=user_id)
+            if knowledge_base_id is None:
+                # A revision stays in the knowledge base of the stored document
+                knowledge_base_id = next(
+                    (metadata.get("knowledge_base_id") for matches in existing.values() for _, metadata in matches),
+                    None,
                 )
+            # Snapshot for rollback: the run pops reused entries from `existing`
+            previous = [match for matches in existing.values() for match in matches]
+
+        try:
+            stats = await WindowedIngestion(self.embedder, self.vector_store).run(
+                self.loader.stream(file_path), split_page, build_metadata,
+                existing=existing,
+                observer=progress.record if progress else None,
             )
-        await self.vector_store.upsert(points)
+
+            # 6. Update mode: whatever was not reused belongs to chunks that vanished
+            deleted = 0
+            if existing:
+                vanished = [point_id for matches in existing.values() for point_id, _ in matches]
+                if vanished:
+                    await self.vector_store.delete_points(vanished)
+                deleted = len(vanished)
+        except Exception:
+            if update:
+                await self._rollback_revision(doc_id, user_id, previous)
+            raise
+        finally:
+            # Points became searchable batch by batch (even if the run failed)
+            invalidate_search_cache(self.vector_store.collection_name, owner=user_id, knowledge_base_id=knowledge_base_id)
+
+        total_chunks = stats["split"].items
         logger.success(
             f"Document {doc_id} processed: "
-            f"{total_chunks} chunks"
+            f"{total_chunks} chunks ({stats['upsert'].items} upserted, "
+            f"{stats['kept'].items} reused, {deleted} deleted)"
         )
-        return {"doc_id": doc_id, "chunks": total_chunks, "category": doc_category}
-
+        return {
+            "doc_id": doc_id,
+            "chunks": total_chunks,
+            "category": doc_category,
+            "upserted": stats["upsert"].items,
+            "reused": stats["kept"].items,
+            "deleted": deleted,
+            "stages": {name: stage.as_dict() for name, stage in stats.items()},
+        }
+
+    async def _rollback_revision(self, doc_id: str, user_id: str, previous: list[tuple[str, dict]]) -> None:
+        """Failed update: drop the points the run added and restore the stored metadata of the rest."""
+        try:
+            await self.vector_store.delete_document(doc_id, user_id=user_id, keep_ids=[pid for pid, _ in previous] or None)
+            if previous:
+                await self.vector_store.set_chunk_metadata(previous)
+            logger.warning(f"Update of document {doc_id} failed: previous revision restored")
+        except Exception as e:
+            logger.error(f"Failed to restore document {doc_id} after a failed update: {e}")
@@ -0,0 +1,171 @@
+"""
+In-memory progress registry for ingestion jobs.
+
+The worker that runs a job updates its JobProgress at every pipeline stage
+(pages loaded, chunks split, chunks embedded, points upserted); status polling
+and the job list read from here without touching the database. The durable
+record of each job lives in the `ingestionjob` table.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.domain.proactiva.schemas.ingestion_job import IngestionJob
+
+# Pipeline stage name -> JobProgress counter it advances
+_STAGE_COUNTERS = {
+    "load": "pages_loaded",
+    "split": "chunks_split",
+    "embed": "chunks_embedded",
+    "upsert": "points_upserted",
+    "kept": "points_upserted",  # Reused points count as stored
+}
+
+
+@dataclass
+class JobProgress:
+    job_id: str
+    user_id: str
+    filename: str = ""
+    knowledge_base_id: Optional[str] = None
+    status: str = "queued"
+    error: Optional[str] = None
+    total_pages: Optional[int] = None
+    pages_loaded: int = 0
+    chunks_split: int = 0
+    chunks_embedded: int = 0
+    points_upserted: int = 0
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def record(self, stage: str, items: int, seconds: float) -> None:
+        """Pipeline observer: advance the counter of `stage`."""
+        counter = _STAGE_COUNTERS.get(stage)
+        if counter:
+            setattr(self, counter, getattr(self, counter) + items)
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    @property
+    def fraction_done(self) -> float:
+        """Rough completion: share of pages parsed times share of split chunks already stored."""
+        if self.status == "completed":
+            return 1.0
+        if not self.total_pages or not self.chunks_split:
+            return 0.0
+        pages = min(1.0, self.pages_loaded / self.total_pages)
+        stored = min(1.0, self.points_upserted / self.chunks_split)
+        return pages * stored
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        if self.status != "running" or not self.started_at:
+            return None
+        done = self.fraction_done
+        if done <= 0.0:
+            return None
+        elapsed = time.time() - self.started_at
+        return elapsed * (1.0 - done) / done
+
+    def as_dict(self) -> dict:
+        eta = self.eta_seconds
+        return {
+            "job_id": self.job_id,
+            "filename": self.filename,
+            "status": self.status,
+            "error": self.error,
+            "total_pages": self.total_pages,
+            "pages_loaded": self.pages_loaded,
+            "chunks_split": self.chunks_split,
+            "chunks_embedded": self.chunks_embedded,
+            "points_upserted": self.points_upserted,
+            "progress": round(self.fraction_done, 3),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "stage_seconds": {k: round(v, 3) for k, v in self.stage_seconds.items()},
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def to_record(self) -> IngestionJob:
+        """Snapshot as a persistable row."""
+        def _dt(ts: Optional[float]) -> Optional[datetime]:
+            return datetime.fromtimestamp(ts, tz=timezone.utc) if ts else None
+
+        return IngestionJob(
+            id=self.job_id,
+            user_id=self.user_id,
+            filename=self.filename,
+            knowledge_base_id=self.knowledge_base_id,
+            status=self.status,
+            error=self.error,
+            total_pages=self.total_pages,
+            pages_loaded=self.pages_loaded,
+            chunks_split=self.chunks_split,
+            chunks_embedded=self.chunks_embedded,
+            points_upserted=self.points_upserted,
+            stage_timings={k: round(v, 3) for k, v in self.stage_seconds.items()} or None,
+            created_at=_dt(self.created_at),
+            started_at=_dt(self.started_at),
+            finished_at=_dt(self.finished_at),
+        )
+
+
+class ProgressRegistry:
+    """Live jobs plus a bounded tail of recently finished ones."""
+
+    def __init__(self, max_finished: int = 1000):
+        self.max_finished = max_finished
+        self._jobs: OrderedDict[str, JobProgress] = OrderedDict()
+
+    def create(self, job_id: str, user_id: str, filename: str = "", knowledge_base_id: Optional[str] = None) -> JobProgress:
+        progress = JobProgress(job_id=job_id, user_id=user_id, filename=filename, knowledge_base_id=knowledge_base_id)
+        self._jobs[job_id] = progress
+        return progress
+
+    def get(self, job_id: str) -> Optional[JobProgress]:
+        return self._jobs.get(job_id)
+
+    def start(self, job_id: str) -> Optional[JobProgress]:
+        progress = self._jobs.get(job_id)
+        if progress:
+            progress.status = "running"
+            progress.started_at = time.time()
+        return progress
+
+    def finish(self, job_id: str, error: Optional[str] = None) -> Optional[JobProgress]:
+        progress = self._jobs.get(job_id)
+        if progress:
+            progress.status = "failed" if error else "completed"
+            progress.error = error
+            progress.finished_at = time.time()
+            self._jobs.move_to_end(job_id)
+            self._evict_finished()
+        return progress
+
+    def list(self, user_id: Optional[str] = None, active_only: bool = False) -> list[JobProgress]:
+        jobs = [
+            job for job in self._jobs.values()
+            if (user_id is None or job.user_id == user_id)
+            and (not active_only or job.status in ("queued", "running"))
+        ]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in ("completed", "failed")]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+
+_registry_instance: ProgressRegistry | None = None
+
+
+def get_progress_registry() -> ProgressRegistry:
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = ProgressRegistry()
+    return _registry_instance
@@ -0,0 +1,133 @@
+"""
+Ingestion worker pool.
+
+Document ingestion jobs run on a fixed number of worker tasks instead of
+unbounded FastAPI BackgroundTasks, so a bulk upload of thousands of files
+cannot monopolize the process that also serves chat requests.
+
+Jobs are queued per tenant (the uploading user) and workers pick tenants in
+round-robin order: one plant onboarding 5 000 manuals does not delay a
+single upload from another user by more than one job per worker.
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+from app.domain.exceptions import CapacityExceededError
+
+
+@dataclass
+class QueuedIngestion:
+    job_id: str
+    tenant: str
+    run: Callable[[], Awaitable[None]]
+
+
+class IngestionWorkerPool:
+    """Bounded worker pool with a global concurrency limit and per-tenant fairness."""
+
+    def __init__(self, max_concurrency: Optional[int] = None, max_queued: Optional[int] = None):
+        self.max_concurrency = max(1, max_concurrency or settings.ingestion_max_concurrency)
+        self.max_queued = max(1, max_queued or settings.ingestion_max_queued)
+        self._queues: OrderedDict[str, deque[QueuedIngestion]] = OrderedDict()
+        self._available = asyncio.Semaphore(0)
+        self._workers: list[asyncio.Task] = []
+        self._active: dict[str, QueuedIngestion] = {}
+        self._reserved = 0  # Slots held by reserve() for jobs not submitted yet
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    @property
+    def reserved(self) -> int:
+        return self._reserved
+
+    @property
+    def active(self) -> int:
+        return len(self._active)
+
+    def start(self) -> None:
+        """Spawn the worker tasks (idempotent). Must be called from the running loop."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(n), name=f"ingestion-worker-{n}")
+            for n in range(self.max_concurrency)
+        ]
+        logger.info(f"[IngestionPool] Started {self.max_concurrency} ingestion workers")
+
+    async def shutdown(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def reserve(self, count: int) -> None:
+        """
+        Hold `count` queue slots for jobs that will be submitted after some awaits
+        (all or nothing). Each `submit(job, reserved=True)` consumes one slot;
+        `release()` returns the ones left unused.
+        """
+        if self.queued + self._reserved + count > self.max_queued:
+            raise CapacityExceededError(
+                f"Ingestion queue cannot take {count} more documents "
+                f"({self.queued + self._reserved}/{self.max_queued} queued). Retry later."
+            )
+        self._reserved += count
+
+    def release(self, count: int) -> None:
+        self._reserved = max(0, self._reserved - count)
+
+    def submit(self, job: QueuedIngestion, reserved: bool = False) -> int:
+        """Enqueue a job and return the number of jobs queued ahead of it."""
+        ahead = self.queued
+        if reserved:
+            self.release(1)
+        elif ahead + self._reserved >= self.max_queued:
+            raise CapacityExceededError(
+                f"Ingestion queue is full ({self.max_queued} jobs). Retry later."
+            )
+        self._queues.setdefault(job.tenant, deque()).append(job)
+        self._available.release()
+        self.start()
+        return ahead
+
+    def _next_job(self) -> QueuedIngestion:
+        # Round-robin: serve the tenant at the head, then move it to the back
+        tenant, queue = next(iter(self._queues.items()))
+        job = queue.popleft()
+        if queue:
+            self._queues.move_to_end(tenant)
+        else:
+            del self._queues[tenant]
+        return job
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            await self._available.acquire()
+            job = self._next_job()
+            self._active[job.job_id] = job
+            try:
+                await job.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[IngestionPool] Job {job.job_id} (tenant {job.tenant}) failed: {e}")
+            finally:
+                self._active.pop(job.job_id, None)
+
+
+_pool_instance: IngestionWorkerPool | None = None
+
+
+def get_ingestion_pool() -> IngestionWorkerPool:
+    global _pool_instance
+    if _pool_instance is None:
+        _pool_instance = IngestionWorkerPool()
+    return _pool_instance
@@ -0,0 +1,43 @@
+"""SQLModel schema for document ingestion jobs."""
+
+from datetime import datetime, timezone
+from typing import Optional
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import JSON, DateTime
+
+
+class IngestionJob(SQLModel, table=True):
+    """One document ingestion run. The id is the document's file_id / task_id."""
+
+    __tablename__ = "ingestionjob"
+
+    id: str = Field(primary_key=True)
+    user_id: str = Field(index=True)
+    filename: str = Field(default="")
+    knowledge_base_id: Optional[str] = Field(default=None)
+
+    status: str = Field(
+        default="queued",
+        description="queued | running | completed | failed",
+        index=True,
+    )
+    error: Optional[str] = Field(default=None)
+
+    total_pages: Optional[int] = Field(default=None)
+    pages_loaded: int = Field(default=0)
+    chunks_split: int = Field(default=0)
+    chunks_embedded: int = Field(default=0)
+    points_upserted: int = Field(default=0)
+    stage_timings: Optional[dict] = Field(
+        default=None,
+        sa_column=Column(JSON),
+        description="Per-stage {items, seconds, items_per_sec} of the finished run",
+    )
+
+    # Timezone-aware UTC timestamps (timestamptz)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    started_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True)))
+    finished_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True)))
@@ -1,22 +1,93 @@
 """Document service — Business logic for document upload, retrieval, and deletion."""
 
 import asyncio
+import json
 import os
+import shutil
 import uuid
-from typing import Optional
+import zipfile
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
 
 from fastapi import UploadFile, BackgroundTasks
 from loguru import logger
 
-from app.persistence.blob import minio_client
+from app.core.config import settings
+from app.persistence.blob import ByteChunkPipe, minio_client
 from app.persistence.vector import QdrantManager
 from app.domain.proactiva.ingestion.pipeline import DocumentProcessor
+from app.domain.proactiva.ingestion.worker_pool import QueuedIngestion, get_ingestion_pool
+from app.domain.proactiva.ingestion.progress import JobProgress, get_progress_registry
+from app.domain.shared.retrieval.result_cache import invalidate_search_cache
+from app.domain.exceptions import ValidationError
+from app.persistence.db import async_session_factory
+from app.persistence.proactiva.repositories.ingestion_job_repository import IngestionJobRepository
 
+SUPPORTED_EXTENSIONS = {".pdf", ".doc", ".docx", ".json"}
+_COPY_BUFFER = 1024 * 1024
 
-def _write_bytes(path: str, data: bytes) -> None:
-    """Synchronous helper for writing bytes to disk, intended for asyncio.to_thread."""
-    with open(path, "wb") as f:
-        f.write(data)
+# Job status -> (Celery-style state expected by the frontend poller, display label)
+_TASK_STATES = {
+    "queued": ("PENDING", "en_cola"),
+    "running": ("PROGRESS", "procesando"),
+    "completed": ("SUCCESS", "completado"),
+    "failed": ("FAILURE", "error"),
+}
+
+
+def _spool_and_feed(spool, pipe: ByteChunkPipe, chunk: bytes) -> None:
+    """Synchronous helper: write a chunk to the local spool file and hand it to the MinIO pipe."""
+    spool.write(chunk)
+    pipe.feed(chunk)
+
+
+def _copy_fileobj(src, path: str) -> None:
+    """Synchronous helper: copy a file object to disk in fixed-size blocks."""
+    src.seek(0)
+    with open(path, "wb") as dst:
+        shutil.copyfileobj(src, dst, _COPY_BUFFER)
+
+
+def _object_name(doc_id: str, source: str) -> str:
+    """MinIO object of a stored document: `{doc_id}_{filename}`.
+
+    `source` is the spooled file's name, `{uuid}_{filename}`, where the uuid is the
+    doc id for single uploads and a staging id for batch uploads and revisions.
+    """
+    return f"{doc_id}_{source.split('_', 1)[-1]}"
+
+
+def _extract_archive(archive_path: str, dest_dir: str, max_members: int, max_bytes: int) -> list[tuple[str, str]]:
+    """Extract supported members of a zip archive. Returns (local_path, original_name) pairs.
+
+    Member paths are flattened to their basename, so entries cannot escape `dest_dir`.
+    Raises ValidationError past `max_members` files or `max_bytes` extracted bytes —
+    counted while copying, not trusted from the archive headers.
+    """
+    extracted = []
+    total = 0
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or Path(name).suffix.lower() not in SUPPORTED_EXTENSIONS:
+                    continue
+                if len(extracted) >= max_members:
+                    raise ValidationError(f"Zip archive has more than {max_members} supported files")
+                target = os.path.join(dest_dir, f"{uuid.uuid4()}_{name}")
+                extracted.append((target, name))
+                with archive.open(info) as src, open(target, "wb") as dst:
+                    while block := src.read(_COPY_BUFFER):
+                        total += len(block)
+                        if total > max_bytes:
+                            raise ValidationError(f"Zip archive expands to more than {max_bytes} bytes")
+                        dst.write(block)
+    except BaseException:
+        for target, _ in extracted:
+            if os.path.exists(target):
+                os.unlink(target)
+        raise
+    return extracted
 
 
 class DocumentService:
@@ -48,11 +119,8 @@ class DocumentService:
         safe_filename = f"{file_id}_{file.filename}"
         temp_path = os.path.join(self.upload_dir, safe_filename)
 
-        # Read async, then write in thread to avoid blocking the event loop
-        content = await file.read()
-        await asyncio.to_thread(_write_bytes, temp_path, content)
-
-        minio_client.upload_file(temp_path, safe_filename)
+        await self._stream_upload(file, temp_path, safe_filename)
+        await self._register_job(file_id, user_id, file.filename, knowledge_base_id)
 
         if background_tasks:
             background_tasks.add_task(
@@ -78,56 +146,338 @@ class DocumentService:
                 "file_id": file_id,
             }
 
-    async def _process_and_cleanup(self, temp_path: str, minio_filename: str, user_id: str, file_id: str, knowledge_base_id: Optional[str]):
+    async def upload_batch(
+        self,
+        files: List[UploadFile],
+        user_id: str,
+        knowledge_base_id: Optional[str] = None,
+    ) -> list[dict]:
+        """Stage many files (zip archives are expanded) and queue them on the ingestion worker pool.
+
+        Each queued job uploads its staged file to MinIO before ingesting it, so the
+        request only writes to local disk; staged files are removed on any failure.
+        Queue slots for the whole batch are reserved up front (CapacityExceededError
+        if they do not fit) and consumed as each job is submitted.
+        """
+        staged: list[tuple[str, str]] = []
+        try:
+            for file in files:
+                filename = file.filename or ""
+                suffix = Path(filename).suffix.lower()
+                if suffix not in SUPPORTED_EXTENSIONS and suffix != ".zip":
+                    logger.warning(f"Skipping unsupported file in batch upload: {filename}")
+                    continue
+                temp_path = os.path.join(self.upload_dir, f"{uuid.uuid4()}_{filename}")
+                await asyncio.to_thread(_copy_fileobj, file.file, temp_path)
+                if suffix != ".zip":
+                    staged.append((temp_path, filename))
+                    continue
+                try:
+                    staged.extend(await asyncio.to_thread(
+                        _extract_archive, temp_path, self.upload_dir,
+                        settings.ingestion_zip_max_members, settings.ingestion_zip_max_bytes,
+                    ))
+                except zipfile.BadZipFile:
+                    logger.warning(f"Skipping invalid zip archive in batch upload: {filename}")
+                finally:
+                    os.unlink(temp_path)
+
+            # Reserve every slot now (no await between check and reservation), so
+            # concurrent batches cannot all pass the check and overfill the queue
+            pool = get_ingestion_pool()
+            pool.reserve(len(staged))
+        except BaseException:
+            for temp_path, _ in staged:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+            raise
+
+        results = []
         try:
+            for temp_path, filename in staged:
+                file_id = str(uuid.uuid4())
+                safe_filename = f"{file_id}_{filename}"
+                await self._register_job(file_id, user_id, filename, knowledge_base_id)
+                pool.submit(QueuedIngestion(
+                    job_id=file_id,
+                    tenant=user_id,
+                    run=lambda args=(temp_path, safe_filename, user_id, file_id, knowledge_base_id): (
+                        self._process_and_cleanup(*args, upload=True)
+                    ),
+                ), reserved=True)
+                results.append({
+                    "task_id": file_id,
+                    "filename": filename,
+                    "status": "en_cola",
+                    "file_id": file_id,
+                })
+        finally:
+            # Registering a job failed: free the slots and files of the ones not queued
+            pool.release(len(staged) - len(results))
+            for temp_path, _ in staged[len(results):]:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+        logger.info(f"Batch upload queued {len(results)} documents for user {user_id}")
+        return results
+
+    async def update_document(
+        self,
+        doc_id: str,
+        file: UploadFile,
+        user_id: str,
+        knowledge_base_id: Optional[str] = None,
+        background_tasks: Optional[BackgroundTasks] = None,
+    ) -> Optional[dict]:
+        """Upload a new revision of an existing document and re-ingest only the chunks that changed.
+
+        Returns None if `user_id` has no document `doc_id`. Each revision is its own job.
+        The revision is only spooled locally: its MinIO object replaces the previous one
+        once re-ingestion succeeds, so a failed update leaves the stored document intact.
+        """
+        metadata = await self.qdrant.get_document_metadata(doc_id, user_id=user_id)
+        if metadata is None:
+            return None
+        knowledge_base_id = knowledge_base_id or metadata.get("knowledge_base_id")
+        previous_object = _object_name(doc_id, metadata.get("source", ""))
+
+        job_id = str(uuid.uuid4())
+        safe_filename = f"{doc_id}_{file.filename}"
+        temp_path = os.path.join(self.upload_dir, f"{job_id}_{file.filename}")
+
+        await asyncio.to_thread(_copy_fileobj, file.file, temp_path)
+        await self._register_job(job_id, user_id, file.filename, knowledge_base_id)
+
+        args = (temp_path, safe_filename, user_id, doc_id, knowledge_base_id)
+        options = {"update": True, "job_id": job_id, "previous_object": previous_object}
+        if background_tasks:
+            background_tasks.add_task(self._process_and_cleanup, *args, **options)
+            status = "procesando"
+        else:
+            await self._process_and_cleanup(*args, **options)
+            status = "completado"
+        return {
+            "task_id": job_id,
+            "filename": file.filename,
+            "status": status,
+            "file_id": doc_id,
+        }
+
+    async def _stream_upload(self, file: UploadFile, temp_path: str, object_name: str) -> int:
+        """
+        Pipe an upload in fixed-size chunks to MinIO (multipart) and to a local spool file at once.
+
+        Disk and network I/O run in worker threads; memory stays at a few chunks plus
+        one multipart part regardless of file size. Returns the number of bytes written.
+        """
+        pipe = ByteChunkPipe()
+
+        async def _upload() -> None:
+            try:
+                await minio_client.aupload_stream(pipe, object_name)
+            except BaseException as e:
+                pipe.abort(e)
+                raise
+
+        upload = asyncio.create_task(_upload())
+        size = 0
+        try:
+            spool = await asyncio.to_thread(open, temp_path, "wb")
+            try:
+                while chunk := await file.read(_COPY_BUFFER):
+                    await asyncio.to_thread(_spool_and_feed, spool, pipe, chunk)
+                    size += len(chunk)
+            finally:
+                await asyncio.to_thread(spool.close)
+            await asyncio.to_thread(pipe.finish)
+        except BaseException as e:
+            pipe.abort(e)
+            await asyncio.gather(upload, return_exceptions=True)
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        try:
+            await upload
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        logger.info(f"Streamed upload '{object_name}' ({size} bytes) to MinIO and spool")
+        return size
+
+    async def _process_and_cleanup(
+        self,
+        temp_path: str,
+        minio_filename: str,
+        user_id: str,
+        file_id: str,
+        knowledge_base_id: Optional[str],
+        update: bool = False,
+        job_id: Optional[str] = None,
+        upload: bool = False,
+        previous_object: Optional[str] = None,
+    ):
+        """
+        Ingest a spooled file (uploading it to MinIO first if `upload`); the spool file is always removed.
+
+        With `update`, the file is uploaded only after re-ingestion succeeds and then
+        replaces `previous_object`.
+        """
+        job_id = job_id or file_id
+        registry = get_progress_registry()
+        progress = registry.get(job_id) or registry.create(job_id, user_id, knowledge_base_id=knowledge_base_id)
+        registry.start(job_id)
+        await self._persist_job(progress)
+        try:
+            if upload:
+                await minio_client.aupload_file(temp_path, minio_filename)
             await self.processor.process_file(
                 temp_path,
                 user_id=user_id,
                 doc_id=file_id,
                 knowledge_base_id=knowledge_base_id,
+                update=update,
+                progress=progress,
             )
+            if update:
+                await self._publish_revision(temp_path, minio_filename, previous_object)
+            registry.finish(job_id)
         except Exception as e:
             logger.error(f"Error processing document {file_id}: {e}")
+            registry.finish(job_id, error=str(e))
+            if update:
+                # Nothing was written to MinIO and the pipeline restored the previous revision
+                return
             try:
-                minio_client.delete_file(minio_filename)
+                await minio_client.adelete_file(minio_filename)
                 logger.info(f"Cleaned up MinIO object '{minio_filename}' after processing failure")
             except Exception as cleanup_err:
                 logger.warning(f"Failed to clean up MinIO object '{minio_filename}': {cleanup_err}")
         finally:
+            await self._persist_job(progress)
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
 
-    async def get_document_details(self, doc_id: str, user_id: str) -> Optional[dict]:
-        """Retrieve aggregated details and metadata for a processed document."""
-        chunks = await self.qdrant.get_document_chunks(doc_id, user_id=user_id)
-        if not chunks:
-            return None
+    @staticmethod
+    async def _publish_revision(temp_path: str, object_name: str, previous_object: Optional[str]) -> None:
+        """Store an ingested revision under `object_name` and drop the previous object if it was renamed."""
+        await minio_client.aupload_file(temp_path, object_name)
+        if previous_object and previous_object != object_name:
+            try:
+                await minio_client.adelete_file(previous_object)
+            except Exception as e:
+                logger.warning(f"Failed to delete previous MinIO object '{previous_object}': {e}")
+
+    async def _register_job(self, job_id: str, user_id: str, filename: Optional[str], knowledge_base_id: Optional[str]) -> JobProgress:
+        """Create the live progress entry and the persisted job row (status: queued)."""
+        progress = get_progress_registry().create(job_id, user_id, filename or "", knowledge_base_id)
+        await self._persist_job(progress)
+        return progress
 
-        first_chunk = chunks[0]
-        category = first_chunk.payload.get("metadata", {}).get("doc_category", "unknown")
-        filename = first_chunk.payload.get("metadata", {}).get("source", "unknown")
+    @staticmethod
+    async def _persist_job(progress: JobProgress) -> None:
+        # Job tracking is best-effort: a DB hiccup must never fail the ingestion itself
+        try:
+            async with async_session_factory() as session:
+                await IngestionJobRepository(session).save(progress.to_record())
+        except Exception as e:
+            logger.warning(f"Failed to persist ingestion job {progress.job_id}: {e}")
 
-        chunks.sort(key=lambda x: x.payload.get("metadata", {}).get("chunk_index", 0))
-        full_text = "\n\n".join(chunk.payload.get("text", "") for chunk in chunks)
+    async def stream_document_details(self, doc_id: str, user_id: str) -> Optional[AsyncIterator[str]]:
+        """
+        JSON body of a processed document ({doc_id, filename, category, content,
+        total_chunks}) as a stream of text pieces, or None if the document does not exist.
 
-        return {
+        Chunks are read in `chunk_index` order and their text is escaped and emitted as
+        it arrives, so neither the chunk list nor the full text is ever held in memory.
+        `total_chunks` goes last because it is only known at the end.
+        """
+        chunks = self.qdrant.iter_document_chunks(doc_id, user_id=user_id)
+        first = await anext(chunks, None)
+        if first is None:
+            await chunks.aclose()
+            return None
+        return self._document_json(doc_id, first, chunks)
+
+    @staticmethod
+    async def _document_json(doc_id: str, first, chunks: AsyncIterator) -> AsyncIterator[str]:
+        metadata = first.payload.get("metadata", {})
+        header = {
             "doc_id": doc_id,
-            "filename": filename,
-            "category": category,
-            "total_chunks": len(chunks),
-            "content": full_text,
+            "filename": metadata.get("source", "unknown"),
+            "category": metadata.get("doc_category", "unknown"),
         }
+        yield json.dumps(header, ensure_ascii=False)[:-1] + ', "content": "'
+
+        total_chunks = 0
+        parts: list[str] = []
+        size = 0
+        record = first
+        try:
+            while record is not None:
+                if total_chunks:
+                    parts.append("\\n\\n")  # JSON-escaped chunk separator
+                # json.dumps of a str, minus its quotes = the escaped string body
+                piece = json.dumps(record.payload.get("text", ""), ensure_ascii=False)[1:-1]
+                parts.append(piece)
+                size += len(piece)
+                total_chunks += 1
+                if size >= 64 * 1024:
+                    yield "".join(parts)
+                    parts, size = [], 0
+                record = await anext(chunks, None)
+        finally:
+            await chunks.aclose()
+        parts.append(f'", "total_chunks": {total_chunks}}}')
+        yield "".join(parts)
 
     async def delete_document(self, doc_id: str, user_id: str) -> dict:
         """Delete all chunks for a document from Qdrant."""
         await self.qdrant.delete_document(doc_id, user_id=user_id)
+        invalidate_search_cache(self.qdrant.collection_name, owner=user_id)
         return {"status": "deleted", "doc_id": doc_id}
 
-    @staticmethod
-    def get_task_status(task_id: str) -> dict:
-        """Simulate status for frontend polling on synchronous operations."""
+    async def get_task_status(self, task_id: str, user_id: Optional[str] = None) -> Optional[dict]:
+        """Status of an ingestion job: live progress if this process runs it, else the persisted row.
+
+        Returns None if the job does not exist or, when `user_id` is given, belongs to another user.
+        """
+        progress = get_progress_registry().get(task_id)
+        if progress:
+            owner = progress.user_id
+            info = progress.as_dict()
+            status = progress.status
+        else:
+            async with async_session_factory() as session:
+                job = await IngestionJobRepository(session).get_by_id(task_id)
+            if not job:
+                return None
+            owner = job.user_id
+            info = job.model_dump(mode="json")
+            status = job.status
+        if user_id is not None and owner != user_id:
+            return None
+
+        state, label = _TASK_STATES.get(status, ("PENDING", status))
+        return {"task_id": task_id, "status": state, "info": {**info, "status": label}}
+
+    async def list_jobs(self, user_id: Optional[str] = None, active_only: bool = False, limit: int = 100) -> dict:
+        """Active/queued/recent jobs (live entries win over persisted rows) plus pool occupancy."""
+        live = {job.job_id: job.as_dict() for job in get_progress_registry().list(user_id, active_only)}
+        async with async_session_factory() as session:
+            rows = await IngestionJobRepository(session).list_jobs(
+                user_id=user_id,
+                statuses=["queued", "running"] if active_only else None,
+                limit=limit,
+            )
+        # Rows still "queued"/"running" but unknown to this process were interrupted by a restart
+        persisted = {row.id: row.model_dump(mode="json") for row in rows if row.id not in live}
+
+        pool = get_ingestion_pool()
         return {
-            "task_id": task_id,
-            "status": "SUCCESS",
-            "info": {"status": "completado"}
+            "pool": {
+                "max_concurrency": pool.max_concurrency,
+                "active": pool.active,
+                "queued": pool.queued,
+            },
+            "jobs": (list(live.values()) + list(persisted.values()))[:limit],
         }
@@ -12,15 +12,15 @@ import uuid
 from typing import Optional, Any
 from pathlib import Path
 
-from qdrant_client.http import models as qmodels
-from qdrant_client.http.models import PointStruct
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from loguru import logger
 
 from app.domain.shared.ingestion.document_loader import DocumentLoader
 from app.domain.shared.ingestion.text_splitter import HierarchicalSplitter
 from app.domain.shared.ingestion.embedder import Embedder
+from app.domain.shared.inference import make_embedder
+from app.domain.shared.retrieval.result_cache import invalidate_search_cache
+from app.domain.shared.ingestion.streaming import WindowedIngestion
 from app.persistence.reactiva.reactive_vector import ReactiveQdrantManager
 
 
@@ -41,7 +41,7 @@ class ReactiveDocumentProcessor:
     ):
         self.loader = loader or DocumentLoader()
         self.splitter = splitter or HierarchicalSplitter()
-        self.embedder = embedder or Embedder()
+        self.embedder = embedder or make_embedder()
         self.vector_store = vector_store or ReactiveQdrantManager()
 
     async def process_file(
@@ -66,73 +66,42 @@ class ReactiveDocumentProcessor:
             chunk_size = system_settings.document_chunk_size
             chunk_overlap = system_settings.document_chunk_overlap
 
-        # 2. Extract text
-        docs = self.loader.load(file_path)
-        for doc in docs:
+        # 2-5. Load → Split (sections + size, single pass) → Embed → Store, in windows
+        def split_page(doc: Document) -> list[Document]:
             doc.metadata["doc_id"] = doc_id
+            return self.splitter.split_documents([doc], chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
-        # 3. Split — Hierarchical → Recursive
-        hierarchical_chunks = self.splitter.split_documents(docs)
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-        )
-        split_chunks = text_splitter.split_documents(hierarchical_chunks)
-
-        chunks = []
-        for i, split_doc in enumerate(split_chunks):
-            new_metadata = {
+        def build_metadata(split_doc: Document, chunk_index: int) -> dict:
+            return {
                 "doc_id": doc_id,
                 "tenant_id": tenant_id,
-                "chunk_index": i,
+                "chunk_index": chunk_index,
                 "knowledge_base_id": knowledge_base_id,
                 "doc_category": "reactive_document",
                 "section": split_doc.metadata.get("section", "No section"),
                 **{
                     k: v
                     for k, v in split_doc.metadata.items()
-                    if k not in ("doc_id", "tenant_id", "chunk_index", "knowledge_base_id", "doc_category")
+                    if k not in ("doc_id", "tenant_id", "chunk_index", "knowledge_base_id", "doc_category", "extract_ms")
                 },
             }
-            chunks.append(Document(page_content=split_doc.page_content, metadata=new_metadata))
-
-        total_chunks = len(chunks)
-        logger.info(f"[ReactiveIngestion] Document split into {total_chunks} chunks")
 
-        # 4. Embed (Dual: Dense + Sparse SPLADE)
-        texts = [chunk.page_content for chunk in chunks]
-        dense_vectors = await self.embedder.embed_documents(texts)
-        sparse_vectors = await self.embedder.embed_sparse_documents(texts)
-
-        # 5. Store in reactive Qdrant collection
-        points = []
-        for i, (chunk, d_vec, s_vec) in enumerate(zip(chunks, dense_vectors, sparse_vectors)):
-            points.append(
-                PointStruct(
-                    id=str(uuid.uuid4()),
-                    vector={
-                        "dense": d_vec,
-                        "sparse": qmodels.SparseVector(
-                            indices=s_vec.indices.tolist(),
-                            values=s_vec.values.tolist(),
-                        ),
-                    },
-                    payload={
-                        "text": chunk.page_content,
-                        "metadata": {
-                            **chunk.metadata,
-                            "doc_id": doc_id,
-                            "tenant_id": tenant_id,
-                            "chunk_index": i,
-                            "knowledge_base_id": knowledge_base_id,
-                        },
-                    },
-                )
+        try:
+            stats = await WindowedIngestion(self.embedder, self.vector_store).run(
+                self.loader.stream(file_path), split_page, build_metadata
             )
-        await self.vector_store.upsert(points)
+        finally:
+            # Points became searchable batch by batch (even if the run failed)
+            invalidate_search_cache(self.vector_store.collection_name, owner=tenant_id, knowledge_base_id=knowledge_base_id)
+
+        total_chunks = stats["split"].items
         logger.success(
             f"[ReactiveIngestion] Document {doc_id} processed: {total_chunks} chunks "
             f"→ reactive collection"
         )
-        return {"doc_id": doc_id, "chunks": total_chunks, "category": "reactive_document"}
+        return {
+            "doc_id": doc_id,
+            "chunks": total_chunks,
+            "category": "reactive_document",
+            "stages": {name: stage.as_dict() for name, stage in stats.items()},
+        }
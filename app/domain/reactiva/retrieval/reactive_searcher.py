@@ -4,25 +4,24 @@ Reuses the shared Embedder (nomic + SPLADE) and Reranker (BGE) but queries
 the `reactive_documents` collection. Filters by tenant_id instead of user_id.
 """
 
-import asyncio
 from typing import Optional, Any
 
 from qdrant_client.http import models as qmodels
 from qdrant_client.http.models import Filter, FieldCondition, MatchValue
 from loguru import logger
 
-from app.domain.shared.ingestion.embedder import Embedder
+from app.domain.shared.inference import make_embedder, make_reranker
+from app.domain.shared.retrieval.result_cache import get_search_cache
 from app.persistence.reactiva.reactive_vector import ReactiveQdrantManager
-from app.domain.shared.retrieval.reranker import Reranker
 
 
 class ReactiveSemanticSearcher:
     """Hybrid semantic search for the reactive domain's knowledge base."""
 
     def __init__(self):
-        self.embedder = Embedder()                    # Shared — same embedding models
+        self.embedder = make_embedder()               # Shared — same embedding models
         self.vector_store = ReactiveQdrantManager()    # Isolated — reactive collection
-        self.reranker = Reranker()                     # Shared — same reranker model
+        self.reranker = make_reranker()                # Shared — same reranker model
 
     async def search(
         self,
@@ -43,11 +42,18 @@ class ReactiveSemanticSearcher:
             if limit is None:
                 final_limit = system_settings.retrieval_search_results
 
-        # 1. Embed query in parallel (Dense + Sparse)
-        query_dense, query_sparse = await asyncio.gather(
-            self.embedder.embed_query(query),
-            self.embedder.embed_sparse_query(query),
-        )
+        # 0. Result cache — a hit skips embedding, Qdrant and reranking
+        cache = get_search_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.key(self.vector_store.collection_name, query, tenant_id, knowledge_base_id, final_limit)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"[ReactiveSearcher] Cache hit ({len(cached)} results, hit rate {cache.hit_rate:.0%})")
+                return cached
+
+        # 1. Embed query in parallel (Dense + Sparse), memoized per query text
+        query_dense, query_sparse = await self.embedder.embed_hybrid_query(query)
 
         # 2. Build filter — scoped by tenant, not user
         conditions = [
@@ -80,6 +86,7 @@ class ReactiveSemanticSearcher:
                 query=query_dense,
                 using="dense",
                 limit=candidates_pool_size,
+                params=self.vector_store.dense_search_params(),  # rescoring for quantized profiles
             ),
         ]
         fusion_query = qmodels.FusionQuery(fusion=qmodels.Fusion.RRF)
@@ -112,5 +119,7 @@ class ReactiveSemanticSearcher:
 
         # 5. Rerank
         results = await self.reranker.rerank(query, candidates, top_k=final_limit)
+        if cache_key is not None:
+            cache.put(cache_key, results)
         logger.info(f"[ReactiveSearcher] Final results after hybrid + rerank: {len(results)}")
         return results
@@ -0,0 +1,15 @@
+"""
+Optional out-of-process inference (embeddings + rerank) with dynamic batching.
+
+Canonical imports:
+    from app.domain.shared.inference import make_embedder, make_reranker
+"""
+
+from app.domain.shared.inference.client import (
+    RemoteEmbedder,
+    RemoteReranker,
+    make_embedder,
+    make_reranker,
+)
+
+__all__ = ["RemoteEmbedder", "RemoteReranker", "make_embedder", "make_reranker"]
@@ -0,0 +1,109 @@
+"""Dynamic request batching for model inference."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from loguru import logger
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into one model call.
+
+    Callers `submit` a list of items and await their results. A single loop
+    takes the first waiting request, keeps collecting more for up to
+    `max_wait_ms` or until `max_batch` items are gathered, runs `fn` once over
+    the concatenation on a dedicated thread, and hands each caller its slice.
+    """
+
+    def __init__(self, name: str, fn: Callable[[list], list], max_batch: int, max_wait_ms: float):
+        self.name = name
+        self.fn = fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: asyncio.Queue[tuple[list, asyncio.Future]] = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"infer-{name}")
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.items = 0
+        self.requests = 0
+        self.busy_seconds = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"batcher-{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(self, items: list) -> list:
+        if not items:
+            return []
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((items, future))
+        return await future
+
+    async def _collect(self) -> list[tuple[list, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        pending = [await self._queue.get()]
+        size = len(pending[0][0])
+        deadline = loop.time() + self.max_wait
+        while size < self.max_batch:
+            if not self._queue.empty():
+                request = self._queue.get_nowait()
+            else:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            pending.append(request)
+            size += len(request[0])
+        return pending
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = await self._collect()
+            # Callers that gave up (timeout / disconnect) are dropped before inference
+            pending = [(items, future) for items, future in pending if not future.done()]
+            if not pending:
+                continue
+            flat = [item for items, _ in pending for item in items]
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self._executor, self.fn, flat)
+            except Exception as e:
+                logger.error(f"[Inference] {self.name} batch of {len(flat)} failed: {e}")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.busy_seconds += time.perf_counter() - started
+            self.batches += 1
+            self.items += len(flat)
+            self.requests += len(pending)
+
+            offset = 0
+            for items, future in pending:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(items)])
+                offset += len(items)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "items_per_sec": round(self.items / self.busy_seconds, 2) if self.busy_seconds else 0.0,
+            "queued": self._queue.qsize(),
+        }
@@ -0,0 +1,105 @@
+"""
+Clients for the local inference server.
+
+RemoteEmbedder and RemoteReranker are drop-in subclasses of Embedder and
+Reranker that send model calls to the inference server instead of running the
+models in-process. `make_embedder()` / `make_reranker()` pick the remote or the
+in-process implementation from `settings.inference_server_url`.
+"""
+
+import asyncio
+import time
+from typing import List, Optional
+from urllib.parse import urlparse
+
+import httpx
+import numpy as np
+from fastembed import SparseEmbedding
+from loguru import logger
+
+from app.core.config import settings
+from app.domain.shared.ingestion.embedder import Embedder
+from app.domain.shared.retrieval.reranker import Reranker
+
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Shared HTTP client for the inference server (TCP or unix socket)."""
+    global _client
+    if _client is None:
+        url = urlparse(settings.inference_server_url)
+        timeout = httpx.Timeout(settings.inference_timeout)
+        if url.scheme == "unix":
+            _client = httpx.AsyncClient(
+                base_url="http://inference",
+                transport=httpx.AsyncHTTPTransport(uds=url.path),
+                timeout=timeout,
+            )
+        else:
+            _client = httpx.AsyncClient(base_url=settings.inference_server_url, timeout=timeout)
+    return _client
+
+
+async def _post(path: str, payload: dict) -> dict:
+    response = await _get_client().post(path, json=payload)
+    response.raise_for_status()
+    return response.json()
+
+
+class RemoteEmbedder(Embedder):
+    """Embedder whose dense / sparse inference runs on the inference server."""
+
+    async def _remote(self, kind: str, texts: List[str]) -> list:
+        data = await _post(f"/embed/{kind}", {"texts": texts})
+        if kind == "dense":
+            return data["vectors"]
+        return [
+            SparseEmbedding(
+                indices=np.asarray(e["indices"], dtype=np.int32),
+                values=np.asarray(e["values"], dtype=np.float32),
+            )
+            for e in data["embeddings"]
+        ]
+
+    async def _embed_batched(self, kind: str, executor, embed_batch, texts: List[str]) -> list:
+        # Micro-batches go out concurrently; the server interleaves them with other
+        # callers' requests (e.g. chat queries) instead of running one huge call.
+        started = time.perf_counter()
+        parts = await asyncio.gather(*(
+            self._remote(kind, texts[i:i + self.batch_size])
+            for i in range(0, len(texts), self.batch_size)
+        ))
+        self.throughput[kind].record(len(texts), time.perf_counter() - started)
+        return [item for part in parts for item in part]
+
+    async def _embed_query_uncached(self, kind: str, text: str):
+        return (await self._remote(kind, [text]))[0]
+
+    async def _embed_query_batch(self, kind: str, texts: List[str]) -> list:
+        return await self._remote(kind, texts)
+
+
+class RemoteReranker(Reranker):
+    """Reranker whose cross-encoder runs on the inference server."""
+
+    async def score(self, pairs: List[List[str]]) -> Optional[List[float]]:
+        try:
+            return (await _post("/rerank", {"pairs": pairs}))["scores"]
+        except Exception as e:
+            # Same degradation as a missing local model: keep first-stage order
+            logger.error(f"[Inference] Remote rerank failed: {e}. RAG will fallback to initial scores.")
+            return None
+
+
+def make_embedder(batch_size: Optional[int] = None) -> Embedder:
+    if settings.inference_server_url:
+        return RemoteEmbedder(batch_size=batch_size)
+    return Embedder(batch_size=batch_size)
+
+
+def make_reranker() -> Reranker:
+    if settings.inference_server_url:
+        return RemoteReranker()
+    return Reranker()
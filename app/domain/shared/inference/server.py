@@ -0,0 +1,119 @@
+"""
+Local inference server for embeddings and reranking.
+
+Runs the dense / sparse embedding models and the cross-encoder in a process of
+their own, so model inference never competes with the API process for the GIL
+or its default thread pool. Requests from every caller (searchers, pipelines,
+other API workers) are coalesced per model by a MicroBatcher.
+
+Listens on `settings.inference_server_url` (a unix:// socket path or an
+http://host:port) unless overridden:
+
+    uv run python -m app.domain.shared.inference.server
+    uv run python -m app.domain.shared.inference.server --uds /tmp/aura-inference.sock
+"""
+
+import argparse
+from contextlib import asynccontextmanager
+from typing import List
+from urllib.parse import urlparse
+
+import uvicorn
+from fastapi import FastAPI
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.domain.shared.inference.batching import MicroBatcher
+from app.domain.shared.model_registry import get_model_registry
+
+
+class TextsRequest(BaseModel):
+    texts: List[str]
+
+
+class RerankRequest(BaseModel):
+    pairs: List[List[str]]
+
+
+def _dense(texts: list[str]) -> list[list[float]]:
+    model = get_model_registry().dense()
+    return [e.tolist() for e in model.embed(texts, batch_size=settings.embedding_batch_size)]
+
+
+def _sparse(texts: list[str]) -> list[dict]:
+    model = get_model_registry().sparse()
+    return [
+        {"indices": e.indices.tolist(), "values": e.values.tolist()}
+        for e in model.embed(texts, batch_size=settings.embedding_batch_size)
+    ]
+
+
+def _rerank(pairs: list[list[str]]) -> list[float]:
+    model = get_model_registry().cross_encoder()
+    if model is None:
+        raise RuntimeError("Reranker model is not available")
+    return [float(score) for score in model.predict(pairs)]
+
+
+_batchers: dict[str, MicroBatcher] = {}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for name, fn in (("dense", _dense), ("sparse", _sparse), ("rerank", _rerank)):
+        _batchers[name] = MicroBatcher(name, fn, settings.inference_max_batch, settings.inference_max_wait_ms)
+        _batchers[name].start()
+    if settings.model_warmup:
+        await get_model_registry().warm_up()
+    logger.info("[Inference] Server ready")
+    yield
+    for batcher in _batchers.values():
+        await batcher.stop()
+    _batchers.clear()
+
+
+app = FastAPI(title="Aura inference server", lifespan=lifespan)
+
+
+@app.post("/embed/dense")
+async def embed_dense(request: TextsRequest):
+    return {"vectors": await _batchers["dense"].submit(request.texts)}
+
+
+@app.post("/embed/sparse")
+async def embed_sparse(request: TextsRequest):
+    return {"embeddings": await _batchers["sparse"].submit(request.texts)}
+
+
+@app.post("/rerank")
+async def rerank(request: RerankRequest):
+    return {"scores": await _batchers["rerank"].submit(request.pairs)}
+
+
+@app.get("/health")
+async def health():
+    return {
+        "status": "healthy",
+        "models": get_model_registry().loaded,
+        "batchers": {name: batcher.stats() for name, batcher in _batchers.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding / rerank inference server")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--uds", default=None, help="Unix socket path (overrides host/port)")
+    args = parser.parse_args()
+
+    url = urlparse(settings.inference_server_url or "http://127.0.0.1:8765")
+    uds = args.uds or (url.path if url.scheme == "unix" and not (args.host or args.port) else None)
+    if uds:
+        uvicorn.run(app, uds=uds, workers=1)
+    else:
+        uvicorn.run(app, host=args.host or url.hostname or "127.0.0.1", port=args.port or url.port or 8765, workers=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,12 @@ Canonical imports:
     from app.domain.shared.ingestion.embedder import Embedder
     from app.domain.shared.ingestion.document_loader import DocumentLoader
     from app.domain.shared.ingestion.text_splitter import HierarchicalSplitter
+    from app.domain.shared.ingestion.streaming import WindowedIngestion
 """
 
 from app.domain.shared.ingestion.embedder import Embedder
 from app.domain.shared.ingestion.document_loader import DocumentLoader
 from app.domain.shared.ingestion.text_splitter import HierarchicalSplitter
+from app.domain.shared.ingestion.streaming import WindowedIngestion
 
-__all__ = ["Embedder", "DocumentLoader", "HierarchicalSplitter"]
+__all__ = ["Embedder", "DocumentLoader", "HierarchicalSplitter", "WindowedIngestion"]
@@ -1,9 +1,184 @@
 # app/domain/shared/ingestion/document_loader.py
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
 from langchain_core.documents import Document
 from loguru import logger
-from pathlib import Path
+
+from app.core.config import settings
+
+# Heading placed before the Markdown tables appended to each PDF page
+TABLES_HEADING = "### Extracted Tables (Structured):"
+
+
+# ---------------------------------------------------------------------------
+# PDF page extraction — module-level so it can be pickled into worker processes
+# ---------------------------------------------------------------------------
+
+def _table_to_markdown(table: list) -> str:
+    # Limpiar celdas (None -> "") y eliminar saltos de línea internos
+    clean_table = [
+        [str(cell or "").strip().replace("\n", " ") for cell in row]
+        for row in table
+    ]
+    if not clean_table:
+        return ""
+
+    # Asumimos primera fila como header
+    headers = clean_table[0]
+    rows = clean_table[1:]
+
+    md_table = f"\n| {' | '.join(headers)} |"
+    md_table += f"\n| {' | '.join(['---'] * len(headers))} |"
+    for row in rows:
+        md_table += f"\n| {' | '.join(row)} |"
+    return md_table
+
+
+def _page_to_text(text: str, tables: list) -> str:
+    # Combinar texto y tablas (dando prioridad a la estructura)
+    # Añadimos las tablas al final del texto de la página para contexto explícito
+    tables_md = [md for md in (_table_to_markdown(t) for t in tables) if md]
+    if tables_md:
+        text += f"\n\n{TABLES_HEADING}\n" + "\n\n".join(tables_md)
+    return text.strip()
+
+
+def _count_ruling_lines(page) -> tuple[int, int]:
+    """Count horizontal / vertical rules in a PyMuPDF page's vector drawings."""
+    horizontal = vertical = 0
+    for path in page.get_drawings():
+        for item in path["items"]:
+            if item[0] == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.y - p2.y) < 1 and abs(p1.x - p2.x) > 10:
+                    horizontal += 1
+                elif abs(p1.x - p2.x) < 1 and abs(p1.y - p2.y) > 10:
+                    vertical += 1
+            elif item[0] == "re":
+                rect = item[1]
+                if rect.height < 2 and rect.width > 10:
+                    horizontal += 1
+                elif rect.width < 2 and rect.height > 10:
+                    vertical += 1
+                elif rect.width > 10 and rect.height > 5:
+                    # Cell box: contributes both edges of each direction
+                    horizontal += 2
+                    vertical += 2
+    return horizontal, vertical
+
+
+def _count_pdf_pages(file_path: str) -> int:
+    import pymupdf
+
+    with pymupdf.open(file_path) as pdf:
+        return pdf.page_count
+
+
+def _extract_pdf_range(
+    file_path: str,
+    start: int,
+    end: int,
+    table_min_rules: int = 4,
+) -> list[tuple[int, str, dict]]:
+    """
+    Extract pages [start, end) (0-based). Runs inside a pool worker process.
+
+    Text comes from PyMuPDF. pdfplumber (much slower) only runs on pages whose
+    drawings contain at least `table_min_rules` horizontal and 2 vertical rules —
+    the ruled tables its default "lines" strategy can detect at all.
+    Returns (page_number, text, extraction_metadata) per page.
+    """
+    import pymupdf
+
+    pages: dict[int, list] = {}  # page_number -> [text, tables, seconds, table_candidate]
+    with pymupdf.open(file_path) as pdf:
+        for index in range(start, end):
+            started = time.perf_counter()
+            page = pdf[index]
+            text = page.get_text("text", sort=True)
+            horizontal, vertical = _count_ruling_lines(page)
+            candidate = table_min_rules > 0 and horizontal >= table_min_rules and vertical >= 2
+            pages[index + 1] = [text, [], time.perf_counter() - started, candidate]
+
+    table_pages = [number for number, page in pages.items() if page[3]]
+    if table_pages:
+        import pdfplumber
+
+        with pdfplumber.open(file_path, pages=table_pages) as pdf:
+            for page in pdf.pages:
+                started = time.perf_counter()
+                entry = pages[page.page_number]
+                entry[1] = page.extract_tables() or []
+                entry[2] += time.perf_counter() - started
+
+    return [
+        (
+            number,
+            _page_to_text(text, tables),
+            {
+                "extractor": "pymupdf+pdfplumber" if candidate else "pymupdf",
+                "tables": len(tables),
+                "extract_ms": round(seconds * 1000, 2),
+            },
+        )
+        for number, (text, tables, seconds, candidate) in pages.items()
+    ]
+
+
+# One pool per worker count: a loader configured differently gets its own pool
+# instead of tearing down one that other streams are still using.
+_pdf_executors: dict[int, ProcessPoolExecutor] = {}
+
+
+def _get_pdf_executor(max_workers: int) -> ProcessPoolExecutor:
+    """Return (and lazily create) the process-wide PDF extraction pool of `max_workers` workers."""
+    executor = _pdf_executors.get(max_workers)
+    if executor is None:
+        # spawn — forking a process that already runs an event loop and threads is unsafe
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _pdf_executors[max_workers] = executor
+        logger.info(f"[DocumentLoader] PDF extraction pool started with {max_workers} workers")
+    return executor
+
 
 class DocumentLoader:
+    """
+    Loads PDF / DOCX / JSON files into LangChain Documents (one per PDF page).
+
+    PDF pages carry `extractor`, `tables` and `extract_ms` metadata; the timing is
+    per page (text + optional table pass) and is not copied into point payloads.
+
+    `load` is the synchronous, all-at-once path. `stream` parses PDF page ranges
+    in a process pool and yields pages in order as soon as they are ready, so the
+    pipeline can split and embed the first pages while later ones are still parsed.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, pages_per_task: Optional[int] = None):
+        self.max_workers = max(1, max_workers or settings.pdf_extract_workers)
+        self.pages_per_task = max(1, pages_per_task or settings.pdf_pages_per_task)
+
+    @staticmethod
+    def _pdf_page_document(path: Path, page_number: int, text: str, total_pages: int, extraction: dict) -> Document:
+        return Document(
+            page_content=text,
+            metadata={
+                "source": path.name,
+                "format": "pdf",
+                "page": page_number,
+                "total_pages": total_pages,
+                **extraction,
+            },
+        )
+
     @staticmethod
     def load(file_path: str) -> list[Document]:
         path = Path(file_path)
@@ -11,56 +186,13 @@ class DocumentLoader:
 
         try:
             if path.suffix.lower() == ".pdf":
-                import pdfplumber
-                
-                documents = []
-                with pdfplumber.open(file_path) as pdf:
-                    for i, page in enumerate(pdf.pages):
-                        # 1. Extraer texto normal
-                        text = page.extract_text() or ""
-                        
-                        # 2. Extraer tablas y convertirlas a Markdown
-                        tables = page.extract_tables()
-                        tables_md = []
-                        if tables:
-                            for table in tables:
-                                # Limpiar celdas (None -> "") y eliminar saltos de línea internos
-                                clean_table = [
-                                    [str(cell or "").strip().replace("\n", " ") for cell in row]
-                                    for row in table
-                                ]
-                                
-                                # Generar tabla Markdown si tiene contenido
-                                if clean_table:
-                                    # Asumimos primera fila como header
-                                    headers = clean_table[0]
-                                    rows = clean_table[1:]
-                                    
-                                    # Construir tabla MD
-                                    md_table = f"\n| {' | '.join(headers)} |"
-                                    md_table += f"\n| {' | '.join(['---'] * len(headers))} |"
-                                    for row in rows:
-                                        md_table += f"\n| {' | '.join(row)} |"
-                                    
-                                    tables_md.append(md_table)
-                        
-                        # 3. Combinar texto y tablas (dando prioridad a la estructura)
-                        # Añadimos las tablas al final del texto de la página para contexto explícito
-                        if tables_md:
-                            text += "\n\n### Extracted Tables (Structured):\n" + "\n\n".join(tables_md)
-
-                        metadata = {
-                            "source": path.name,
-                            "format": "pdf",
-                            "page": i + 1,
-                            "total_pages": len(pdf.pages)
-                        }
-                        
-                        documents.append(Document(
-                            page_content=text.strip(),
-                            metadata=metadata
-                        ))
-                return documents
+                total_pages = _count_pdf_pages(str(path))
+                return [
+                    DocumentLoader._pdf_page_document(path, page_number, text, total_pages, extraction)
+                    for page_number, text, extraction in _extract_pdf_range(
+                        str(path), 0, total_pages, settings.pdf_table_min_rules
+                    )
+                ]
 
             elif path.suffix.lower() in [".docx", ".doc"]:
                 from langchain_community.document_loaders import Docx2txtLoader
@@ -84,3 +216,65 @@ class DocumentLoader:
         except Exception as e:
             logger.error(f"Failed to load document {file_path}: {e}")
             raise
+
+    async def stream(self, file_path: Path | str) -> AsyncIterator[Document]:
+        """Yield documents as they are parsed. PDFs are extracted page-range-parallel."""
+        path = Path(file_path)
+        if path.suffix.lower() != ".pdf":
+            for doc in await asyncio.to_thread(self.load, str(path)):
+                yield doc
+            return
+
+        logger.info(f"Streaming document: {file_path} ({self.max_workers} workers)")
+        try:
+            total_pages = await asyncio.to_thread(_count_pdf_pages, str(path))
+        except Exception as e:
+            logger.error(f"Failed to load document {file_path}: {e}")
+            raise
+
+        loop = asyncio.get_running_loop()
+        executor = _get_pdf_executor(self.max_workers)
+        ranges = iter(
+            (start, min(start + self.pages_per_task, total_pages))
+            for start in range(0, total_pages, self.pages_per_task)
+        )
+        # Bound the number of in-flight ranges so parsed pages never pile up
+        # faster than the consumer can split/embed them.
+        pending: deque[asyncio.Future] = deque()
+
+        def submit_next() -> None:
+            page_range = next(ranges, None)
+            if page_range is not None:
+                pending.append(loop.run_in_executor(
+                    executor, _extract_pdf_range, str(path), *page_range, settings.pdf_table_min_rules
+                ))
+
+        for _ in range(self.max_workers * 2):
+            submit_next()
+
+        extract_ms = 0.0
+        table_pages = 0
+        try:
+            while pending:
+                try:
+                    pages = await pending.popleft()
+                except Exception as e:
+                    logger.error(f"Failed to load document {file_path}: {e}")
+                    raise
+                submit_next()
+                for page_number, text, extraction in pages:
+                    extract_ms += extraction["extract_ms"]
+                    table_pages += extraction["extractor"] != "pymupdf"
+                    logger.debug(
+                        f"[DocumentLoader] {path.name} p{page_number}: {extraction['extractor']}, "
+                        f"{extraction['tables']} tables, {extraction['extract_ms']} ms"
+                    )
+                    yield self._pdf_page_document(path, page_number, text, total_pages, extraction)
+        finally:
+            for future in pending:
+                future.cancel()
+
+        logger.info(
+            f"[DocumentLoader] {path.name}: {total_pages} pages, {table_pages} with tables, "
+            f"{extract_ms / max(1, total_pages):.1f} ms/page extraction"
+        )
@@ -1,35 +1,284 @@
 import asyncio
-from fastembed import TextEmbedding, SparseTextEmbedding
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+from fastembed import SparseEmbedding
+from loguru import logger
 from app.core.config import settings
-from typing import List
+from app.domain.shared.ingestion.embedding_cache import get_embedding_cache, text_key
+from app.domain.shared.model_registry import get_model_registry
+from typing import List, Optional
+
+
+# Cache (de)serialization: dense as float32 bytes, sparse as int32 indices + float32 values
+def _encode_dense(vector: List[float]) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def _decode_dense(blob: bytes) -> List[float]:
+    return np.frombuffer(blob, dtype=np.float32).tolist()
+
+
+def _encode_sparse(embedding) -> bytes:
+    return (
+        np.asarray(embedding.indices, dtype=np.int32).tobytes()
+        + np.asarray(embedding.values, dtype=np.float32).tobytes()
+    )
+
+
+def _decode_sparse(blob: bytes):
+    half = len(blob) // 2
+    return SparseEmbedding(
+        values=np.frombuffer(blob[half:], dtype=np.float32),
+        indices=np.frombuffer(blob[:half], dtype=np.int32),
+    )
+
+
+@dataclass
+class ThroughputCounter:
+    """Cumulative texts embedded and busy seconds for one model."""
+
+    texts: int = 0
+    seconds: float = 0.0
+
+    def record(self, texts: int, seconds: float) -> None:
+        self.texts += texts
+        self.seconds += seconds
+
+    @property
+    def texts_per_second(self) -> float:
+        return self.texts / self.seconds if self.seconds > 0 else 0.0
+
+
+class QueryVectorCache:
+    """Bounded LRU of query text -> vector, shared by every Embedder in the process."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, object] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = len(self._entries)
+        return {"entries": entries, "hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 3)}
+
+
+_query_cache: QueryVectorCache | None = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryVectorCache:
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = QueryVectorCache(settings.query_embedding_cache_size)
+    return _query_cache
+
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _get_executor(kind: str) -> ThreadPoolExecutor:
+    """Process-wide document-embedding executor for one model (shared by every Embedder)."""
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            # One thread per concurrently ingested document, like the per-Embedder pools it replaces
+            executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.ingestion_max_concurrency),
+                thread_name_prefix=f"embed-{kind}",
+            )
+            _executors[kind] = executor
+        return executor
+
 
 class Embedder:
-    def __init__(self):
-        # BGE-small-en-v1.5 or the one in settings (Dense)
-        self.dense_model = TextEmbedding(model_name=settings.embedding_model)
-        # SPLADE (Sparse)
-        self.sparse_model = SparseTextEmbedding(model_name=settings.sparse_embedding_model)
+    def __init__(self, batch_size: Optional[int] = None):
+        # Models live in the process-wide registry: loaded once on first use, shared
+        # by every Embedder (searchers, pipelines, services).
+        self.models = get_model_registry()
+
+        self.batch_size = max(1, batch_size or settings.embedding_batch_size)
+        # One dedicated executor per model so document batches of both models run in
+        # parallel (ONNX Runtime releases the GIL) without occupying the default pool,
+        # which stays free for query embeddings. Shared process-wide: Embedders are
+        # built per request and must not each leave threads behind.
+        self._dense_executor = _get_executor("dense")
+        self._sparse_executor = _get_executor("sparse")
+        self.throughput = {"dense": ThroughputCounter(), "sparse": ThroughputCounter()}
+        # Content-addressed cache shared by every Embedder in the process (None if disabled)
+        self.cache = get_embedding_cache()
+        # Query vectors (dense and sparse) memoized by exact text — survives KB changes
+        self.query_cache = get_query_cache()
+
+    @property
+    def dense_model(self):
+        """nomic-embed (or settings.embedding_model), shared."""
+        return self.models.dense()
+
+    @property
+    def sparse_model(self):
+        """SPLADE (or settings.sparse_embedding_model), shared."""
+        return self.models.sparse()
+
+    async def _embed_batched(self, kind: str, executor: ThreadPoolExecutor, embed_batch, texts: List[str]) -> list:
+        """Run `embed_batch` over micro-batches on `executor`, recording throughput."""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        results = []
+        for i in range(0, len(texts), self.batch_size):
+            results.extend(await loop.run_in_executor(executor, embed_batch, texts[i:i + self.batch_size]))
+        self.throughput[kind].record(len(texts), time.perf_counter() - started)
+        return results
+
+    async def _embed_cached(self, kind: str, model_name: str, executor, embed_batch, encode, decode, texts: List[str]) -> list:
+        """Serve texts from the embedding cache and run inference only for the misses."""
+        if self.cache is None or not texts:
+            return await self._embed_batched(kind, executor, embed_batch, texts)
+
+        keys = [text_key(t) for t in texts]
+        cached = await asyncio.to_thread(self.cache.get_many, model_name, keys)
+
+        # Embed each distinct missing text once, even if it repeats within the batch
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        computed: dict = {}
+        if missing:
+            vectors = await self._embed_batched(kind, executor, embed_batch, list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            await asyncio.to_thread(
+                self.cache.put_many, model_name, {k: encode(v) for k, v in computed.items()}
+            )
+
+        logger.debug(f"[Embedder] {kind}: {len(texts) - len(missing)}/{len(texts)} texts served from cache")
+        return [computed[k] if k in computed else decode(cached[k]) for k in keys]
+
+    def _dense_batch(self, texts: List[str]) -> List[List[float]]:
+        return [e.tolist() for e in self.dense_model.embed(texts, batch_size=self.batch_size)]
+
+    def _sparse_batch(self, texts: List[str]) -> list:
+        return list(self.sparse_model.embed(texts, batch_size=self.batch_size))
 
     async def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Genera embeddings densos."""
-        return await asyncio.to_thread(
-            lambda: [e.tolist() for e in self.dense_model.embed(texts)]
+        return await self._embed_cached(
+            "dense", settings.embedding_model, self._dense_executor, self._dense_batch,
+            _encode_dense, _decode_dense, texts,
         )
 
     async def embed_sparse_documents(self, texts: List[str]):
         """Genera embeddings dispersos (SPLADE)."""
+        return await self._embed_cached(
+            "sparse", settings.sparse_embedding_model, self._sparse_executor, self._sparse_batch,
+            _encode_sparse, _decode_sparse, texts,
+        )
+
+    async def embed_hybrid_documents(self, texts: List[str]) -> tuple[List[List[float]], list]:
+        """Genera embeddings densos y dispersos en paralelo (wall time ≈ el modelo más lento)."""
+        dense, sparse = await asyncio.gather(
+            self.embed_documents(texts),
+            self.embed_sparse_documents(texts),
+        )
+        return dense, sparse
+
+    async def _embed_query_uncached(self, kind: str, text: str):
+        if kind == "dense":
+            return await asyncio.to_thread(
+                lambda: next(self.dense_model.embed([text])).tolist()
+            )
         return await asyncio.to_thread(
-            lambda: list(self.sparse_model.embed(texts))
+            lambda: next(self.sparse_model.embed([text]))
         )
 
+    async def _query_vector(self, kind: str, text: str):
+        model_name = settings.embedding_model if kind == "dense" else settings.sparse_embedding_model
+        key = (kind, model_name, text)
+        vector = self.query_cache.get(key)
+        if vector is None:
+            vector = await self._embed_query_uncached(kind, text)
+            self.query_cache.put(key, vector)
+        return vector
+
     async def embed_query(self, text: str) -> List[float]:
         """Genera un embedding denso para una consulta."""
-        return await asyncio.to_thread(
-            lambda: next(self.dense_model.embed([text])).tolist()
-        )
+        return await self._query_vector("dense", text)
 
     async def embed_sparse_query(self, text: str):
         """Genera un embedding disperso para una consulta."""
-        return await asyncio.to_thread(
-            lambda: next(self.sparse_model.embed([text]))
+        return await self._query_vector("sparse", text)
+
+    async def embed_hybrid_query(self, text: str) -> tuple[List[float], object]:
+        """Dense + sparse query vectors in parallel; memoized (see `query_cache.stats()`)."""
+        dense, sparse = await asyncio.gather(
+            self._query_vector("dense", text),
+            self._query_vector("sparse", text),
+        )
+        logger.debug(f"[Embedder] Query vector cache hit rate: {self.query_cache.hit_rate:.0%}")
+        return dense, sparse
+
+    async def _embed_query_batch(self, kind: str, texts: List[str]) -> list:
+        # Default executor, like single queries: the per-model pools and the
+        # throughput counters belong to ingestion
+        embed_batch = self._dense_batch if kind == "dense" else self._sparse_batch
+        results = []
+        for i in range(0, len(texts), self.batch_size):
+            results.extend(await asyncio.to_thread(embed_batch, texts[i:i + self.batch_size]))
+        return results
+
+    async def _query_vectors(self, kind: str, texts: List[str]) -> list:
+        """Memoized query vectors for several texts; the misses are embedded as one batch."""
+        model_name = settings.embedding_model if kind == "dense" else settings.sparse_embedding_model
+        keys = [(kind, model_name, text) for text in texts]
+        vectors = {}
+        for key in keys:
+            vector = self.query_cache.get(key)
+            if vector is not None:
+                vectors[key] = vector
+        missing = list(dict.fromkeys(key for key in keys if key not in vectors))
+        if missing:
+            computed = await self._embed_query_batch(kind, [key[2] for key in missing])
+            for key, vector in zip(missing, computed):
+                self.query_cache.put(key, vector)
+                vectors[key] = vector
+        return [vectors[key] for key in keys]
+
+    async def embed_hybrid_queries(self, texts: List[str]) -> tuple[List[List[float]], list]:
+        """Dense + sparse vectors for several queries: one batched call per model."""
+        dense, sparse = await asyncio.gather(
+            self._query_vectors("dense", texts),
+            self._query_vectors("sparse", texts),
         )
+        return dense, sparse
@@ -0,0 +1,128 @@
+"""
+Content-addressed embedding cache.
+
+Persists chunk embeddings in a local SQLite file keyed by (model name, SHA-256 of
+the chunk text), so re-uploaded revisions and boilerplate shared between the
+proactive and reactive collections skip model inference. Size is bounded by
+entry count with least-recently-used eviction.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Iterable, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+def text_key(text: str) -> str:
+    """Cache key for a chunk text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed LRU of serialized vectors. Thread-safe; call it from worker threads."""
+
+    _SQL_BATCH = 500  # Stay well below SQLite's bound-parameter limit
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.path = path or settings.embedding_cache_path
+        self.max_entries = max(1, max_entries or settings.embedding_cache_max_entries)
+        self.hits = 0
+        self.misses = 0
+
+        dir_name = os.path.dirname(self.path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+            " last_used INTEGER NOT NULL, PRIMARY KEY (model, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+
+        self._count, max_used = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(last_used), 0) FROM embeddings"
+        ).fetchone()
+        self._clock = max_used
+        logger.info(f"[EmbeddingCache] Opened {self.path} ({self._count}/{self.max_entries} entries)")
+
+    @staticmethod
+    def _batches(items: list, size: int) -> Iterable[list]:
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
+
+    def get_many(self, model: str, keys: list[str]) -> dict[str, bytes]:
+        """Return the cached values found for `keys` and mark them as recently used."""
+        found: dict[str, bytes] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for batch in self._batches(unique_keys, self._SQL_BATCH):
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                    (model, *batch),
+                ).fetchall()
+                found.update(rows)
+            if found:
+                self._clock += 1
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND key = ?",
+                    [(self._clock, model, key) for key in found],
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(unique_keys) - len(found)
+        return found
+
+    def put_many(self, model: str, items: dict[str, bytes]) -> None:
+        """Insert values, evicting the least recently used entries beyond `max_entries`."""
+        if not items:
+            return
+        with self._lock:
+            self._clock += 1
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, key, value, last_used) VALUES (?, ?, ?, ?)",
+                [(model, key, value, self._clock) for key, value in items.items()],
+            )
+            self._count += self._conn.total_changes - before
+
+            excess = self._count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN"
+                    " (SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                    (excess,),
+                )
+                self._count -= excess
+            self._conn.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+_cache_instance: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Return the process-wide cache, or None when disabled in settings."""
+    global _cache_instance
+    if not settings.embedding_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = EmbeddingCache()
+    return _cache_instance
@@ -0,0 +1,222 @@
+"""
+Windowed streaming ingestion.
+
+Runs Load → Split → Embed → Upsert as concurrent stages linked by bounded
+asyncio queues. Chunks travel in fixed-size windows, so peak memory depends on
+`window_size * queue_depth`, not on document size, and points reach Qdrant
+while later pages are still being parsed. Upserts go through a BulkWriter
+(size-bounded batches, a few in flight, `wait=False`); the run ends with its
+consistency barrier, so on single-shard collections every point is searchable
+when `run()` returns (see vector_writer for the multi-shard caveat).
+
+Every chunk carries a `chunk_hash` (SHA-256 of its text). In update mode the
+caller passes the hashes already stored for the document; matching chunks keep
+their existing points (only their metadata is refreshed when it changed) and
+only new or edited chunks are embedded and upserted.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Optional
+
+from langchain_core.documents import Document
+from loguru import logger
+from qdrant_client.http import models as qmodels
+from qdrant_client.http.models import PointStruct
+
+from app.core.config import settings
+from app.domain.shared.ingestion.embedder import Embedder
+from app.domain.shared.ingestion.embedding_cache import text_key
+from app.persistence.vector_writer import BulkWriter
+
+
+# chunk_hash -> [(point_id, stored_metadata), ...] for a document already in Qdrant
+ExistingChunks = dict[str, list[tuple[str, dict]]]
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+
+    name: str
+    items: int = 0
+    seconds: float = 0.0
+    observer: Optional[Callable[[str, int, float], None]] = field(default=None, repr=False)
+
+    def record(self, items: int, seconds: float) -> None:
+        self.items += items
+        self.seconds += seconds
+        if self.observer:
+            self.observer(self.name, items, seconds)
+
+    @property
+    def throughput(self) -> float:
+        """Items per second of busy time in this stage."""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "items": self.items,
+            "seconds": round(self.seconds, 3),
+            "items_per_sec": round(self.throughput, 2),
+        }
+
+
+class WindowedIngestion:
+    """
+    Bounded-memory ingestion pipeline shared by the proactive and reactive processors.
+
+    The caller provides the page stream, a per-page split function and a metadata
+    builder; this class owns windowing, embedding, point construction and upserts.
+    """
+
+    _DONE = None  # Queue sentinel
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        vector_store,
+        window_size: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+    ):
+        self.embedder = embedder
+        self.vector_store = vector_store
+        self.window_size = max(1, window_size or settings.ingestion_window_size)
+        self.queue_depth = max(1, queue_depth or settings.ingestion_queue_depth)
+
+    async def run(
+        self,
+        pages: AsyncIterator[Document],
+        split: Callable[[Document], list[Document]],
+        build_metadata: Callable[[Document, int], dict],
+        existing: Optional[ExistingChunks] = None,
+        observer: Optional[Callable[[str, int, float], None]] = None,
+    ) -> dict[str, StageStats]:
+        """
+        Drive `pages` through the pipeline. Returns per-stage stats.
+
+        If `existing` is given, reused entries are popped from it, so whatever remains
+        afterwards are the points of chunks that vanished from the document.
+        `observer(stage, items, seconds)` is called every time a stage makes progress.
+        """
+        stats = {name: StageStats(name, observer=observer) for name in ("load", "split", "embed", "upsert", "kept")}
+        to_embed: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+        to_store: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+
+        writer = BulkWriter(self.vector_store)
+        tasks = [
+            asyncio.create_task(self._split_stage(pages, split, build_metadata, to_embed, stats)),
+            asyncio.create_task(self._embed_stage(to_embed, to_store, stats, existing)),
+            asyncio.create_task(self._store_stage(to_store, stats, writer)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await writer.aclose()
+            raise
+
+        logger.info(
+            "[Ingestion] Stage throughput: "
+            + ", ".join(f"{s.name}={s.throughput:.1f}/s ({s.items} in {s.seconds:.2f}s)" for s in stats.values())
+            + " | embedder: "
+            + ", ".join(f"{k}={c.texts_per_second:.1f} texts/s" for k, c in self.embedder.throughput.items())
+            + f" | writer: {writer.points_per_second:.0f} points/s"
+        )
+        return stats
+
+    async def _split_stage(self, pages, split, build_metadata, out_q: asyncio.Queue, stats: dict) -> None:
+        window: list[Document] = []
+        chunk_index = 0
+        iterator = pages.__aiter__()
+        while True:
+            started = time.perf_counter()
+            try:
+                page = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+            stats["load"].record(1, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            split_chunks = split(page)
+            for split_doc in split_chunks:
+                window.append(Document(
+                    page_content=split_doc.page_content,
+                    metadata={
+                        **build_metadata(split_doc, chunk_index),
+                        "chunk_hash": text_key(split_doc.page_content),
+                    },
+                ))
+                chunk_index += 1
+            stats["split"].record(len(split_chunks), time.perf_counter() - started)
+
+            while len(window) >= self.window_size:
+                await out_q.put(window[:self.window_size])
+                window = window[self.window_size:]
+
+        if window:
+            await out_q.put(window)
+        await out_q.put(self._DONE)
+
+    async def _embed_stage(self, in_q: asyncio.Queue, out_q: asyncio.Queue, stats: dict, existing) -> None:
+        while (window := await in_q.get()) is not self._DONE:
+            started = time.perf_counter()
+            fresh, metadata_updates = self._partition(window, existing)
+            stats["kept"].record(len(window) - len(fresh), 0.0)
+
+            dense_vectors, sparse_vectors = [], []
+            if fresh:
+                texts = [chunk.page_content for chunk in fresh]
+                dense_vectors, sparse_vectors = await self.embedder.embed_hybrid_documents(texts)
+            stats["embed"].record(len(fresh), time.perf_counter() - started)
+            await out_q.put((fresh, dense_vectors, sparse_vectors, metadata_updates))
+        await out_q.put(self._DONE)
+
+    @staticmethod
+    def _partition(window: list[Document], existing: Optional[ExistingChunks]):
+        """Split a window into chunks to embed and metadata refreshes for reused points."""
+        if existing is None:
+            return window, []
+        fresh, metadata_updates = [], []
+        for chunk in window:
+            matches = existing.get(chunk.metadata["chunk_hash"])
+            if not matches:
+                fresh.append(chunk)
+                continue
+            point_id, stored_metadata = matches.pop()
+            if stored_metadata != chunk.metadata:
+                metadata_updates.append((point_id, chunk.metadata))
+        return fresh, metadata_updates
+
+    async def _store_stage(self, in_q: asyncio.Queue, stats: dict, writer: BulkWriter) -> None:
+        while (item := await in_q.get()) is not self._DONE:
+            window, dense_vectors, sparse_vectors, metadata_updates = item
+            started = time.perf_counter()
+            if metadata_updates:
+                await self.vector_store.set_chunk_metadata(metadata_updates)
+            if not window:
+                continue
+            points = [
+                PointStruct(
+                    id=str(uuid.uuid4()),
+                    vector={
+                        "dense": d_vec,
+                        "sparse": qmodels.SparseVector(
+                            indices=s_vec.indices.tolist(),
+                            values=s_vec.values.tolist(),
+                        ),
+                    },
+                    payload={"text": chunk.page_content, "metadata": chunk.metadata},
+                )
+                for chunk, d_vec, s_vec in zip(window, dense_vectors, sparse_vectors)
+            ]
+            await writer.submit(points)
+            stats["upsert"].record(len(points), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await writer.flush()
+        stats["upsert"].record(0, time.perf_counter() - started)
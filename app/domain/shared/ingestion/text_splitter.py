@@ -1,40 +1,221 @@
 from langchain_core.documents import Document
+from typing import Iterator, Optional
 import re
 
+from app.domain.shared.ingestion.document_loader import TABLES_HEADING
+
+# Numbered section ("1. Title", "2.3 ") — matched against the stripped line
+_NUMBERED_HEADER = re.compile(r"\d+\.?\d*\.?\s+[A-Za-záéíóúñÁÉÍÓÚÑ]")
+_WHITESPACE = re.compile(r"\s")
+# Break points tried in order when a section exceeds chunk_size (same priority as
+# RecursiveCharacterTextSplitter's defaults)
+_SEPARATORS = ("\n\n", "\n", " ")
+_MAX_HEADER_LEN = 100
+# Markdown table delimiter row ("| --- | :---: |")
+_TABLE_DELIMITER = re.compile(r"\s*\|(\s*:?-{3,}:?\s*\|)+\s*$")
+
+
 class HierarchicalSplitter:
+    """
+    Single-pass section + size splitter.
+
+    One scan over each page detects section headers (numbered or ALL-CAPS lines)
+    and, when `chunk_size` is given, cuts each section body into chunks of at most
+    `chunk_size` characters at the best separator, with `chunk_overlap` characters
+    carried over. Everything works on offsets into the page text; each chunk is a
+    single slice.
+
+    Markdown tables (header + delimiter row) are never cut mid-row: a table that
+    fits in `chunk_size` becomes one chunk, a larger one is emitted as row-groups
+    with the header repeated. Table chunks carry `content_type="table"` plus
+    `table_index`, `table_columns`, `table_rows`, `row_start` and `row_end`.
+    """
+
     def __init__(self):
         pass
 
-    def split_documents(self, documents: list[Document]) -> list[Document]:
+    def split_documents(
+        self,
+        documents: list[Document],
+        chunk_size: Optional[int] = None,
+        chunk_overlap: int = 0,
+    ) -> list[Document]:
         chunks = []
         for doc in documents:
-            # Intentar detectar secciones por títulos
-            lines = doc.page_content.split("\n")
-            current_section = ""
-            current_content = []
-
-            for line in lines:
-                clean_line = line.strip()
-                # Numbered section ("1. Title", "2.3 ") OR all-uppercase header (must have ≥1 cased char)
-                is_section_header = (
-                    bool(re.match(r"^\d+\.?\d*\.?\s+[A-Za-záéíóúñÁÉÍÓÚÑ]", clean_line))
-                    or (clean_line.isupper() and len(clean_line.replace(" ", "")) >= 3)
-                ) and len(clean_line) < 100
-                if is_section_header:
-                    if current_content:
-                        chunks.append(self._create_chunk("\n".join(current_content), current_section, doc))
-                        current_content = []
-                    current_section = clean_line
+            text = doc.page_content
+            table_index = 0
+            for kind, section, start, end in self._blocks(text):
+                if kind == "table":
+                    chunks.extend(self._table_chunks(text[start:end], section, doc, table_index, chunk_size))
+                    table_index += 1
+                    continue
+                if chunk_size is None:
+                    spans = [(start, end)]
                 else:
-                    current_content.append(line)
+                    spans = self._windows(text, start, end, chunk_size, chunk_overlap)
+                for a, b in spans:
+                    content = text[a:b].strip()
+                    if content:
+                        chunks.append(self._create_chunk(content, section, doc))
+        return chunks
+
+    @staticmethod
+    def _is_header(text: str, start: int, end: int) -> bool:
+        # Long lines without surrounding whitespace can never strip below the limit
+        if end - start >= _MAX_HEADER_LEN and not text[start].isspace() and not text[end - 1].isspace():
+            return False
+        clean_line = text[start:end].strip()
+        if not clean_line or len(clean_line) >= _MAX_HEADER_LEN:
+            return False
+        # Numbered section OR all-uppercase header (must have ≥1 cased char)
+        return bool(_NUMBERED_HEADER.match(clean_line)) or (
+            clean_line.isupper() and len(clean_line.replace(" ", "")) >= 3
+        )
 
-            if current_content:
-                chunks.append(self._create_chunk("\n".join(current_content), current_section, doc))
+    @staticmethod
+    def _is_table_start(text: str, start: int, end: int) -> bool:
+        """A pipe row immediately followed by a delimiter row."""
+        if not text[start:end].lstrip().startswith("|") or end >= len(text):
+            return False
+        next_end = text.find("\n", end + 1)
+        return bool(_TABLE_DELIMITER.match(text, end + 1, len(text) if next_end == -1 else next_end))
 
-        # Size enforcement is handled entirely by pipeline.py (RecursiveCharacterTextSplitter
-        # with DB-configurable chunk_size/overlap). This stage only adds section metadata.
+    def _blocks(self, text: str) -> Iterator[tuple[str, str, int, int]]:
+        """
+        Yield ("text" | "table", section_title, start, end) spans in page order.
+
+        Header lines and the loader's tables heading are excluded from bodies; a
+        table runs from its header row to the last consecutive pipe row.
+        """
+        section = ""
+        body_start = 0
+        pos = 0
+        length = len(text)
+        while pos <= length:
+            newline = text.find("\n", pos)
+            line_end = length if newline == -1 else newline
+            if line_end > pos and self._is_table_start(text, pos, line_end):
+                if body_start < pos:
+                    yield "text", section, body_start, pos - 1
+                table_start = pos
+                while True:
+                    pos = line_end + 1
+                    if pos >= length:
+                        break
+                    newline = text.find("\n", pos)
+                    next_end = length if newline == -1 else newline
+                    if not text[pos:next_end].lstrip().startswith("|"):
+                        break
+                    line_end = next_end
+                yield "table", section, table_start, line_end
+                body_start = pos = line_end + 1
+                continue
+            if line_end > pos and (
+                self._is_header(text, pos, line_end) or text[pos:line_end].strip() == TABLES_HEADING
+            ):
+                if body_start < pos:
+                    yield "text", section, body_start, pos - 1
+                if text[pos:line_end].strip() != TABLES_HEADING:
+                    section = text[pos:line_end].strip()
+                body_start = line_end + 1
+            if newline == -1:
+                break
+            pos = newline + 1
+        if body_start < length:
+            yield "text", section, body_start, length
+
+    def _table_chunks(
+        self,
+        table: str,
+        section: str,
+        original_doc: Document,
+        table_index: int,
+        chunk_size: Optional[int],
+    ) -> list[Document]:
+        """One chunk per table, or row-groups of at most chunk_size chars with the header repeated."""
+        lines = [line.strip() for line in table.split("\n") if line.strip()]
+        header, rows = "\n".join(lines[:2]), lines[2:]
+        columns = [cell.strip() for cell in lines[0].strip("|").split("|")]
+
+        groups: list[list[str]] = []
+        size = len(header)
+        for row in rows:
+            # A single row is never split, even if it alone exceeds chunk_size
+            if groups and (chunk_size is None or size + 1 + len(row) <= chunk_size):
+                groups[-1].append(row)
+                size += 1 + len(row)
+            else:
+                groups.append([row])
+                size = len(header) + 1 + len(row)
+
+        if not groups:
+            # Header-only table: one whole-table chunk, no row range to report
+            chunk = self._create_chunk(header, section, original_doc)
+            chunk.metadata.update({
+                "content_type": "table",
+                "table_index": table_index,
+                "table_columns": columns,
+                "table_rows": 0,
+            })
+            return [chunk]
+
+        chunks = []
+        row_start = 1
+        for group in groups:
+            chunk = self._create_chunk("\n".join([header, *group]), section, original_doc)
+            chunk.metadata.update({
+                "content_type": "table",
+                "table_index": table_index,
+                "table_columns": columns,
+                "table_rows": len(rows),
+                "row_start": row_start,
+                "row_end": row_start + len(group) - 1,
+            })
+            row_start += len(group)
+            chunks.append(chunk)
         return chunks
 
+    @staticmethod
+    def _windows(text: str, start: int, end: int, chunk_size: int, chunk_overlap: int) -> list[tuple[int, int]]:
+        """Cut [start, end) into spans of at most chunk_size chars, preferring separator boundaries."""
+        chunk_size = max(1, chunk_size)
+        chunk_overlap = max(0, min(chunk_overlap, chunk_size - 1))
+        spans = []
+        while start < end and text[start].isspace():
+            start += 1
+        floor = start
+        while start < end:
+            if end - start <= chunk_size:
+                spans.append((start, end))
+                break
+
+            limit = start + chunk_size
+            cut = -1
+            for separator in _SEPARATORS:
+                # Only past the previous cut (and its whitespace): finding it again would
+                # emit a window made only of overlap, contained in the previous one
+                idx = text.rfind(separator, max(start, floor) + 1, limit)
+                if idx != -1:
+                    cut = idx
+                    break
+            if cut == -1:
+                cut = limit  # No separator in range: hard cut
+            spans.append((start, cut))
+            floor = cut
+            while floor < end and text[floor].isspace():
+                floor += 1
+
+            # Carry the overlap back from the cut, snapped forward to a word boundary
+            next_start = cut
+            if chunk_overlap and cut - chunk_overlap > start:
+                match = _WHITESPACE.search(text, cut - chunk_overlap, cut)
+                if match:
+                    next_start = match.end()
+            while next_start < end and text[next_start].isspace():
+                next_start += 1
+            start = next_start
+        return spans
+
     def _create_chunk(self, content, section, original_doc):
         return Document(
             page_content=content.strip(),
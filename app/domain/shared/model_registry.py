@@ -0,0 +1,104 @@
+"""
+Process-wide model registry.
+
+Embedder and Reranker instances are cheap wrappers; the ONNX / PyTorch models
+behind them (nomic dense, SPLADE sparse, bge-reranker cross-encoder) are loaded
+here once per process on first use and shared by reference. Searchers,
+pipelines and services can create as many wrappers as they like without
+loading the weights again.
+
+`warm_up()` loads the models ahead of the first request (see
+`settings.model_warmup`).
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+class ModelRegistry:
+    """Lazily loaded, shared model instances keyed by (kind, model name)."""
+
+    def __init__(self):
+        self._models: dict[tuple[str, str], Any] = {}
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _get(self, kind: str, name: str, factory: Callable[[str], Any]) -> Any:
+        key = (kind, name)
+        if key in self._models:
+            return self._models[key]
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        # Per-model lock: concurrent first callers wait for a single load
+        with lock:
+            if key not in self._models:
+                started = time.perf_counter()
+                self._models[key] = factory(name)
+                logger.info(f"[ModelRegistry] Loaded {kind} model '{name}' in {time.perf_counter() - started:.1f}s")
+        return self._models[key]
+
+    def dense(self, name: Optional[str] = None):
+        from fastembed import TextEmbedding
+        return self._get("dense", name or settings.embedding_model, lambda n: TextEmbedding(model_name=n))
+
+    def sparse(self, name: Optional[str] = None):
+        from fastembed import SparseTextEmbedding
+        return self._get("sparse", name or settings.sparse_embedding_model, lambda n: SparseTextEmbedding(model_name=n))
+
+    def cross_encoder(self, name: Optional[str] = None, backend: Optional[str] = None):
+        """
+        The reranker model for `settings.reranker_backend`, or None if it failed to
+        load (callers fall back to first-stage scores). Both backends expose
+        `predict(pairs)`.
+        """
+        backend = backend or settings.reranker_backend
+
+        def load(n: str):
+            try:
+                if backend in ("onnx", "onnx-int8"):
+                    from app.domain.shared.retrieval.onnx_reranker import OnnxCrossEncoder
+                    return OnnxCrossEncoder(
+                        settings.reranker_onnx_dir,
+                        quantized=backend == "onnx-int8",
+                        max_length=settings.reranker_max_length,
+                        truncation=settings.reranker_truncation,
+                        threads=settings.reranker_onnx_threads,
+                    )
+                from sentence_transformers import CrossEncoder
+                return CrossEncoder(n)
+            except Exception as e:
+                logger.error(f"Failed to load reranker model ({backend}): {e}. RAG will fallback to initial scores.")
+                return None
+
+        return self._get(f"cross_encoder:{backend}", name or settings.reranker_model, load)
+
+    @property
+    def loaded(self) -> list[str]:
+        return [f"{kind}:{name}" for kind, name in self._models]
+
+    def _warm_up_sync(self) -> None:
+        # One tiny inference per model so ONNX / torch lazy initialization happens now too
+        list(self.dense().embed(["warm-up"]))
+        list(self.sparse().embed(["warm-up"]))
+        reranker = self.cross_encoder()
+        if reranker is not None:
+            reranker.predict([["warm-up", "warm-up"]])
+
+    async def warm_up(self) -> None:
+        started = time.perf_counter()
+        await asyncio.to_thread(self._warm_up_sync)
+        logger.success(f"[ModelRegistry] Models warm ({', '.join(self.loaded)}) in {time.perf_counter() - started:.1f}s")
+
+
+# Created eagerly (it holds no models yet) so executor threads never race to create it
+_registry_instance = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    return _registry_instance
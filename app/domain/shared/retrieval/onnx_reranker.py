@@ -0,0 +1,94 @@
+"""
+ONNX Runtime cross-encoder.
+
+CPU backend for the reranker: the model exported with
+`scripts/export_reranker_onnx.py` (fp32 `model.onnx` and the dynamically
+quantized `model_int8.onnx`, plus `tokenizer.json`) is scored with ONNX
+Runtime. Exposes the same `predict(pairs)` as sentence-transformers'
+CrossEncoder — including its sigmoid over the single logit, so scores are
+probabilities in (0, 1) whichever backend is active.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from loguru import logger
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class OnnxCrossEncoder:
+    """
+    Scores [query, passage] pairs with an exported sequence-classification model.
+
+    Pairs are truncated to `max_length` tokens with `truncation`
+    ("only_second" keeps the query intact and cuts the passage; "longest_first"
+    matches CrossEncoder's default). Within a call, pairs are sorted by token
+    length before batching so each batch pads to a similar length.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        quantized: bool = True,
+        max_length: int = 512,
+        truncation: str = "only_second",
+        threads: int = 0,
+        batch_size: int = 16,
+    ):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        directory = Path(model_dir)
+        model_path = directory / (INT8_FILE if quantized else FP32_FILE)
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"{model_path} not found — export it with scripts/export_reranker_onnx.py"
+            )
+
+        self.tokenizer = Tokenizer.from_file(str(directory / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=max_length, strategy=truncation)
+        self.tokenizer.no_padding()
+        self.pad_id = self.tokenizer.token_to_id("<pad>") or 0
+        self.batch_size = max(1, batch_size)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        logger.info(
+            f"[OnnxCrossEncoder] {model_path.name} loaded "
+            f"(max_length={max_length}, truncation={truncation})"
+        )
+
+    def _run(self, encodings: list) -> np.ndarray:
+        width = max(len(e.ids) for e in encodings)
+        input_ids = np.full((len(encodings), width), self.pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), width), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            input_ids[row, :len(encoding.ids)] = encoding.ids
+            attention_mask[row, :len(encoding.ids)] = 1
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        logits = self.session.run(None, feeds)[0].reshape(len(encodings), -1)[:, 0]
+        # CrossEncoder's default activation for num_labels=1 (monotonic: rankings unchanged)
+        return 1 / (1 + np.exp(-logits))
+
+    def predict(self, pairs: List[List[str]], batch_size: Optional[int] = None) -> np.ndarray:
+        if not pairs:
+            return np.zeros(0, dtype=np.float32)
+        encodings = self.tokenizer.encode_batch([(query, passage) for query, passage in pairs])
+        order = sorted(range(len(encodings)), key=lambda i: len(encodings[i].ids))
+        batch_size = batch_size or self.batch_size
+
+        scores = np.empty(len(encodings), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            scores[batch] = self._run([encodings[i] for i in batch])
+        return scores
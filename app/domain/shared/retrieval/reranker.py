@@ -1,7 +1,7 @@
 import asyncio
-from sentence_transformers import CrossEncoder
 from app.core.config import settings
-from typing import List, Dict
+from app.domain.shared.model_registry import get_model_registry
+from typing import List, Dict, Optional
 from loguru import logger
 
 class Reranker:
@@ -10,36 +10,130 @@ class Reranker:
     Calculates exact query-document interaction for superior precision.
     """
     def __init__(self):
-        logger.info(f"Initializing Reranker with model: {settings.reranker_model}")
-        try:
-            self.model = CrossEncoder(settings.reranker_model)
-        except Exception as e:
-            logger.error(f"Failed to load reranker model: {e}. RAG will fallback to initial scores.")
-            self.model = None
-
-    async def rerank(self, query: str, documents: List[Dict], top_k: int = 5) -> List[Dict]:
+        # The cross-encoder is loaded once per process by the model registry
+        self.models = get_model_registry()
+
+    @property
+    def model(self):
+        """Shared CrossEncoder, or None if it failed to load."""
+        return self.models.cross_encoder()
+
+    def _predict(self, pairs: List[List[str]]):
+        # Resolved here (worker thread) so a first-use model load never blocks the event loop
+        model = self.model
+        return model.predict(pairs) if model is not None else None
+
+    async def score(self, pairs: List[List[str]]) -> Optional[List[float]]:
+        """Cross-encoder scores for [query, text] pairs, or None if no model is available."""
+        # Cross-encoder inference (scoring) — offloaded to thread to avoid blocking event loop
+        # Returns raw scores (usually higher is more relevant)
+        return await asyncio.to_thread(self._predict, pairs)
+
+    async def rerank(
+        self,
+        query: str,
+        documents: List[Dict],
+        top_k: int = 5,
+        adaptive: Optional[bool] = None,
+    ) -> List[Dict]:
         """
         Reranks documents based on actual relevance to the query.
+
+        `documents` must be in first-stage (RRF) order. In adaptive mode
+        (`settings.rerank_adaptive` unless overridden) they are cross-encoded in
+        small batches and scoring stops early once a batch cannot reach the top-k.
         """
-        if not documents or not self.model:
+        if not documents:
             return documents[:top_k]
 
+        if adaptive is None:
+            adaptive = settings.rerank_adaptive
+
         logger.debug(f"Reranking {len(documents)} documents for query: {query[:50]}...")
 
-        # Prepare pairs: [query, document_text]
-        pairs = [[query, doc["text"]] for doc in documents]
-        
-        # Cross-encoder inference (scoring) — offloaded to thread to avoid blocking event loop
-        # Returns raw scores (usually higher is more relevant)
-        scores = await asyncio.to_thread(self.model.predict, pairs)
-        
-        # Update scores and track reranking impact
-        for i, score in enumerate(scores):
-            documents[i]["original_score"] = documents[i].get("score", 0.0)
-            documents[i]["score"] = float(score) # Primary score is now the reranked one
+        scored = await (self._score_adaptive if adaptive else self._score_all)(query, documents, top_k)
+        if scored is None:
+            return documents[:top_k]
 
         # Sort by the new score
-        reranked = sorted(documents, key=lambda x: x["score"], reverse=True)
-        
-        logger.info(f"Reranking complete. Top score: {reranked[0]['score']:.4f}")
+        reranked = sorted(scored, key=lambda x: x["score"], reverse=True)
+
+        logger.info(
+            f"Reranking complete ({len(scored)}/{len(documents)} pairs scored). "
+            f"Top score: {reranked[0]['score']:.4f}"
+        )
         return reranked[:top_k]
+
+    @staticmethod
+    def _apply_scores(documents: List[Dict], scores) -> None:
+        # Update scores and track reranking impact
+        for doc, score in zip(documents, scores):
+            doc["original_score"] = doc.get("score", 0.0)
+            doc["score"] = float(score) # Primary score is now the reranked one
+
+    @staticmethod
+    def cutoff_reached(top_scores: List[float], batch_scores, top_k: int, margin: float) -> bool:
+        """Adaptive stop rule: `top_scores` (the k best so far, this batch included) is full
+        and the batch's best is more than `margin` below the k-th of them."""
+        return len(top_scores) >= top_k and max(batch_scores) < top_scores[-1] - margin
+
+    async def _score_all(self, query: str, documents: List[Dict], top_k: int) -> Optional[List[Dict]]:
+        # Prepare pairs: [query, document_text]
+        pairs = [[query, doc["text"]] for doc in documents]
+        scores = await self.score(pairs)
+        if scores is None:
+            return None
+        self._apply_scores(documents, scores)
+        return documents
+
+    async def _score_adaptive(self, query: str, documents: List[Dict], top_k: int) -> Optional[List[Dict]]:
+        """
+        Score in RRF order, `rerank_batch_size` pairs at a time. After each batch
+        (once at least top_k candidates are scored), stop if the batch's best score
+        is more than `rerank_margin` below the current k-th best: candidates ranked
+        lower by RRF are then unlikely to displace the top-k. Scores are cross-encoder
+        probabilities, so the margin means the same on every backend.
+        """
+        batch_size = max(1, settings.rerank_batch_size)
+        scored: List[Dict] = []
+        top_scores: List[float] = []
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            scores = await self.score([[query, doc["text"]] for doc in batch])
+            if scores is None:
+                return scored or None
+            self._apply_scores(batch, scores)
+            scored.extend(batch)
+
+            top_scores = sorted(top_scores + [float(s) for s in scores], reverse=True)[:top_k]
+            if self.cutoff_reached(top_scores, scores, top_k, settings.rerank_margin):
+                break
+        return scored
+
+    async def rerank_many(
+        self,
+        queries: List[str],
+        documents: List[List[Dict]],
+        top_k: int = 5,
+    ) -> List[List[Dict]]:
+        """
+        Rerank the candidates of several queries with a single cross-encoder call.
+
+        `documents[i]` holds the candidates of `queries[i]`. Every pair is scored
+        (no adaptive early stop): one large batch amortizes the model call better
+        than cutting each query short. Returns one top-k list per query.
+        """
+        pairs = [[query, doc["text"]] for query, docs in zip(queries, documents) for doc in docs]
+        scores = await self.score(pairs) if pairs else None
+        if scores is None:
+            return [docs[:top_k] for docs in documents]
+
+        results = []
+        offset = 0
+        for docs in documents:
+            self._apply_scores(docs, scores[offset:offset + len(docs)])
+            offset += len(docs)
+            results.append(sorted(docs, key=lambda x: x["score"], reverse=True)[:top_k])
+
+        logger.info(f"Batch reranking complete ({len(pairs)} pairs for {len(queries)} queries)")
+        return results
@@ -0,0 +1,127 @@
+"""
+Search result cache shared by the proactive and reactive searchers.
+
+Entries are keyed by (collection, normalized query, owner, knowledge base,
+limit) plus the current index versions of that owner and knowledge base. The
+pipelines bump those versions when a document finishes ingesting and the
+document service bumps them on deletion, so a version change makes every
+older entry unreachable (it then ages out of the LRU). A hit skips query
+embedding, Qdrant and reranking entirely.
+
+The cache is in-process: each API worker keeps its own.
+"""
+
+import copy
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = "¿?¡!.,;: "
+
+
+def normalize_query(query: str) -> str:
+    """Case-, whitespace- and edge-punctuation-insensitive form of a query."""
+    return _WHITESPACE.sub(" ", query.lower()).strip(_EDGE_PUNCTUATION)
+
+
+class SearchResultCache:
+    """TTL + LRU cache of reranked search results with per-owner / per-KB versions."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, list]] = OrderedDict()
+        self._versions: dict[tuple[str, str, Optional[str]], int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _version(self, namespace: str, scope: str, value: Optional[str]) -> int:
+        return self._versions.get((namespace, scope, value), 0)
+
+    def bump(self, namespace: str, owner: Optional[str] = None, knowledge_base_id: Optional[str] = None) -> None:
+        """Invalidate cached results for an owner and/or knowledge base of `namespace`."""
+        for scope, value in (("owner", owner), ("kb", knowledge_base_id)):
+            if value is not None:
+                key = (namespace, scope, str(value))
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def key(
+        self,
+        namespace: str,
+        query: str,
+        owner: str,
+        knowledge_base_id: Optional[str],
+        limit: int,
+    ) -> Hashable:
+        owner = str(owner)
+        kb = str(knowledge_base_id) if knowledge_base_id is not None else None
+        return (
+            namespace,
+            normalize_query(query),
+            owner,
+            kb,
+            limit,
+            self._version(namespace, "owner", owner),
+            self._version(namespace, "kb", kb) if kb is not None else 0,
+        )
+
+    def get(self, key: Hashable) -> Optional[list[dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Callers (and the reranker) mutate result dicts: never hand out the stored ones
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: Hashable, results: list[dict[str, Any]]) -> None:
+        self._entries[key] = (time.monotonic(), copy.deepcopy(results))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+_cache_instance: SearchResultCache | None = None
+
+
+def get_search_cache() -> Optional[SearchResultCache]:
+    """Process-wide result cache, or None when disabled in settings."""
+    global _cache_instance
+    if not settings.search_cache_enabled:
+        return None
+    if _cache_instance is None:
+        _cache_instance = SearchResultCache(settings.search_cache_max_entries, settings.search_cache_ttl_seconds)
+        logger.info(
+            f"[SearchCache] Enabled ({settings.search_cache_max_entries} entries, "
+            f"TTL {settings.search_cache_ttl_seconds:.0f}s)"
+        )
+    return _cache_instance
+
+
+def invalidate_search_cache(namespace: str, owner: Optional[str] = None, knowledge_base_id: Optional[str] = None) -> None:
+    """Bump index versions after documents of `owner` / `knowledge_base_id` changed."""
+    cache = get_search_cache()
+    if cache is not None:
+        cache.bump(namespace, owner=owner, knowledge_base_id=knowledge_base_id)
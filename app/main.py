@@ -21,11 +21,14 @@ from app.core.middleware import GlobalExceptionHandler
 
 from app.api.router import api_router
 from app.persistence.db import init_db
+from app.persistence.vector import close_qdrant_clients
 from app.persistence.proactiva.memoryAI.checkpointer import get_checkpointer, close_pool
 from app.persistence.proactiva.memoryAI.store import get_store
 from app.domain.proactiva.db_collector.scheduler import collector_scheduler
 from app.domain.reactiva.events.event_service import EventProcessorService
+from app.domain.proactiva.ingestion.worker_pool import get_ingestion_pool
 from app.domain.shared.agent.tools.omniparser_service import get_omniparser
+from app.domain.shared.model_registry import get_model_registry
 
 UPLOAD_DIR = "/tmp/uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -109,6 +112,9 @@ async def lifespan(app: FastAPI):
     # Start the DB Collector scheduler (loads all enabled sources as cron jobs)
     await collector_scheduler.start()
 
+    # Start the bounded document ingestion worker pool (bulk uploads)
+    get_ingestion_pool().start()
+
     # Start the reactive event processor worker loop
     event_service = EventProcessorService()
     event_worker_task = asyncio.create_task(event_service.run())
@@ -116,6 +122,18 @@ async def lifespan(app: FastAPI):
     event_worker_task.add_done_callback(_background_tasks.discard)
     app.state.event_service = event_service
 
+    # Load the shared embedding / reranker models now instead of on the first chat (non-blocking)
+    if settings.model_warmup:
+        async def _model_warmup():
+            try:
+                await get_model_registry().warm_up()
+            except Exception as e:
+                logger.error(f"[ModelRegistry] Warm-up failed, models will load on first use: {e}")
+
+        t = asyncio.create_task(_model_warmup())
+        _background_tasks.add(t)
+        t.add_done_callback(_background_tasks.discard)
+
     # Auto-download OmniParser V2 weights if not present (non-blocking background task)
     if settings.omniparser_enabled:
         async def _omniparser_download():
@@ -139,8 +157,10 @@ async def lifespan(app: FastAPI):
     yield
 
     event_worker_task.cancel()
+    await get_ingestion_pool().shutdown()
     await collector_scheduler.shutdown()
     await close_pool()
+    await close_qdrant_clients()
 
     # Gracefully shutdown Playwright browser if it was initialized
     try:
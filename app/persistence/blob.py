@@ -1,44 +1,216 @@
+"""
+MinIO blob store.
+
+One `Minio` client — and therefore one urllib3 connection pool — is shared by
+every bucket wrapper in the process (proactive and reactive). Buckets are
+checked/created lazily on first use instead of at import time, and every
+operation has an async variant (`a*` methods) that runs on a dedicated thread
+pool so handlers never block the event loop on network I/O.
+"""
+
+import asyncio
+import io
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Optional
+
+import certifi
+import urllib3
 from minio import Minio
 from app.core.config import settings
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_exponential
-import os
-import tempfile
-from datetime import timedelta
+
+
+class ByteChunkPipe(io.RawIOBase):
+    """
+    Blocking file-like bridge between a producer pushing byte chunks and a consumer
+    calling read() from another thread (e.g. MinIO multipart upload).
+
+    The queue is bounded, so a slow consumer applies backpressure to the producer and
+    memory stays at roughly `maxsize` chunks plus one multipart part.
+    """
+
+    _EOF = None
+
+    def __init__(self, maxsize: int = 4):
+        super().__init__()
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._buffer = bytearray()
+        self._eof = False
+        self._error: BaseException | None = None
+
+    def readable(self) -> bool:
+        return True
+
+    def _put(self, item) -> None:
+        while True:
+            if self._error is not None:
+                raise IOError("Stream consumer failed") from self._error
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def feed(self, chunk: bytes) -> None:
+        """Producer side: enqueue a chunk (blocks while the queue is full)."""
+        self._put(bytes(chunk))
+
+    def finish(self) -> None:
+        """Producer side: signal end of stream."""
+        self._put(self._EOF)
+
+    def abort(self, error: BaseException) -> None:
+        """Either side: fail the stream so the other side stops waiting."""
+        self._error = error
+        try:
+            self._queue.put_nowait(self._EOF)
+        except queue.Full:
+            pass
+
+    def read(self, size: int = -1) -> bytes:
+        """Consumer side: block until `size` bytes (or end of stream) are available."""
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            item = self._queue.get()
+            if self._error is not None:
+                raise IOError("Stream producer failed") from self._error
+            if item is self._EOF:
+                self._eof = True
+            else:
+                self._buffer += item
+        if size < 0 or size >= len(self._buffer):
+            data, self._buffer = bytes(self._buffer), bytearray()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return data
+
+
+_shared_client: Optional[Minio] = None
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def _get_shared_client() -> Minio:
+    """Return the process-wide Minio client backed by a single pooled HTTP manager."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            http_client = urllib3.PoolManager(
+                maxsize=settings.minio_max_connections,
+                timeout=urllib3.Timeout(connect=10, read=300),
+                cert_reqs="CERT_REQUIRED",
+                ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+                retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+            )
+            _shared_client = Minio(
+                endpoint=settings.minio_endpoint,
+                access_key=settings.minio_access_key,
+                secret_key=settings.minio_secret_key,
+                secure=settings.minio_secure,
+                http_client=http_client,
+            )
+        return _shared_client
+
+
+def _get_shared_executor() -> ThreadPoolExecutor:
+    """Threads used by the async methods — sized like the connection pool."""
+    global _shared_executor
+    with _shared_lock:
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(
+                max_workers=settings.minio_max_connections, thread_name_prefix="blob"
+            )
+        return _shared_executor
 
 
 class MinIOClient:
     def __init__(self):
-        self.client = Minio(
-            endpoint=settings.minio_endpoint,
-            access_key=settings.minio_access_key,
-            secret_key=settings.minio_secret_key,
-            secure=settings.minio_secure,
-        )
+        self.client = _get_shared_client()
         self.bucket = settings.minio_bucket
-        self._ensure_bucket()
+        self._bucket_ready = False
+        self._bucket_lock = threading.Lock()
 
     @retry(stop=stop_after_attempt(10), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _ensure_bucket(self):
-        if not self.client.bucket_exists(self.bucket):
-            self.client.make_bucket(self.bucket)
-            logger.success(f"Bucket '{self.bucket}' creado")
-        else:
-            logger.info(f"Bucket '{self.bucket}' ya existe")
+        if self._bucket_ready:
+            return
+        with self._bucket_lock:
+            if self._bucket_ready:
+                return
+            if not self.client.bucket_exists(self.bucket):
+                self.client.make_bucket(self.bucket)
+                logger.success(f"Bucket '{self.bucket}' creado")
+            else:
+                logger.info(f"Bucket '{self.bucket}' ya existe")
+            self._bucket_ready = True
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(_get_shared_executor(), fn, *args)
 
     def upload_file(self, local_path: str, object_name: str):
-        """Sube un archivo local a MinIO"""
-        self.client.fput_object(self.bucket, object_name, local_path)
+        """Sube un archivo local a MinIO (multipart con partes en paralelo)"""
+        self._ensure_bucket()
+        self.client.fput_object(
+            self.bucket,
+            object_name,
+            local_path,
+            part_size=settings.minio_part_size,
+            num_parallel_uploads=settings.minio_parallel_transfers,
+        )
         logger.info(f"Archivo subido: {object_name}")
 
+    def upload_stream(self, stream, object_name: str, part_size: int | None = None):
+        """Sube un stream de longitud desconocida mediante multipart upload (bloqueante)."""
+        self._ensure_bucket()
+        self.client.put_object(
+            self.bucket,
+            object_name,
+            data=stream,
+            length=-1,
+            part_size=part_size or settings.minio_part_size,
+            num_parallel_uploads=settings.minio_parallel_transfers,
+        )
+        logger.info(f"Archivo subido (stream): {object_name}")
+
+    def _download_range(self, object_name: str, path: str, offset: int, length: int):
+        response = self.client.get_object(self.bucket, object_name, offset=offset, length=length)
+        try:
+            with open(path, "r+b") as f:
+                f.seek(offset)
+                for data in response.stream(1024 * 1024):
+                    f.write(data)
+        finally:
+            response.close()
+            response.release_conn()
+
     def download_file(self, object_name: str) -> str:
-        """Descarga un archivo de MinIO y lo guarda en un archivo temporal."""
+        """Descarga un archivo de MinIO y lo guarda en un archivo temporal.
 
+        Objetos mayores que `minio_part_size` se descargan en rangos paralelos.
+        """
+        self._ensure_bucket()
         _, ext = os.path.splitext(object_name)
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=ext)
         temp_path = temp_file.name
         temp_file.close()
-        self.client.fget_object(self.bucket, object_name, temp_path)
+
+        size = self.client.stat_object(self.bucket, object_name).size or 0
+        part_size = settings.minio_part_size
+        if size <= part_size or settings.minio_parallel_transfers <= 1:
+            self.client.fget_object(self.bucket, object_name, temp_path)
+        else:
+            with open(temp_path, "wb") as f:
+                f.truncate(size)
+            ranges = [(offset, min(part_size, size - offset)) for offset in range(0, size, part_size)]
+            with ThreadPoolExecutor(max_workers=settings.minio_parallel_transfers) as pool:
+                for future in [pool.submit(self._download_range, object_name, temp_path, *r) for r in ranges]:
+                    future.result()
         logger.info(f"Archivo descargado con extensión: {temp_path}")
 
         return temp_path
@@ -49,8 +221,25 @@ class MinIOClient:
 
     def delete_file(self, object_name: str):
         """Elimina un archivo del bucket (opcional)"""
+        self._ensure_bucket()
         self.client.remove_object(self.bucket, object_name)
 
+    # ── Async API — same operations, offloaded to the shared blob thread pool ──
+
+    async def aupload_file(self, local_path: str, object_name: str):
+        await self._run(self.upload_file, local_path, object_name)
+
+    async def aupload_stream(self, stream, object_name: str, part_size: int | None = None):
+        await self._run(self.upload_stream, stream, object_name, part_size)
+
+    async def adownload_file(self, object_name: str) -> str:
+        return await self._run(self.download_file, object_name)
+
+    async def aget_presigned_url(self, object_name: str, expires: int = 3600) -> str:
+        return await self._run(self.get_presigned_url, object_name, expires)
+
+    async def adelete_file(self, object_name: str):
+        await self._run(self.delete_file, object_name)
 
 
-minio_client = MinIOClient()
\ No newline at end of file
+minio_client = MinIOClient()
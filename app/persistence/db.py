@@ -16,6 +16,7 @@ from app.domain.proactiva.schemas.llm_config import LLMConfig  # noqa: F401
 from app.domain.proactiva.schemas.model import Model  # noqa: F401
 from app.domain.proactiva.schemas.mcp_source import MCPSource  # noqa: F401
 from app.domain.proactiva.schemas.tool_config import ToolConfig  # noqa: F401
+from app.domain.proactiva.schemas.ingestion_job import IngestionJob  # noqa: F401
 from app.domain.shared.schemas.db_source import DbSource  # noqa: F401
 from app.domain.reactiva.schemas.event import Event  # noqa: F401
 # Reactive domain schemas
@@ -0,0 +1,37 @@
+"""Ingestion job repository — Data access layer for the IngestionJob model."""
+
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.domain.proactiva.schemas.ingestion_job import IngestionJob
+
+
+class IngestionJobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def save(self, job: IngestionJob) -> IngestionJob:
+        """Insert or update a job row."""
+        job = await self.session.merge(job)
+        await self.session.commit()
+        return job
+
+    async def get_by_id(self, job_id: str) -> Optional[IngestionJob]:
+        return await self.session.get(IngestionJob, job_id)
+
+    async def list_jobs(
+        self,
+        user_id: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        limit: int = 100,
+    ) -> List[IngestionJob]:
+        stmt = select(IngestionJob)
+        if user_id is not None:
+            stmt = stmt.where(IngestionJob.user_id == user_id)
+        if statuses:
+            stmt = stmt.where(IngestionJob.status.in_(statuses))
+        stmt = stmt.order_by(IngestionJob.created_at.desc()).limit(limit)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
@@ -1,8 +1,8 @@
 """MinIO client for the reactive domain — isolated bucket.
 
 Inherits all methods from MinIOClient but points to the
-`reactive-bucket` bucket. Same MinIO server and credentials,
-different namespace.
+`reactive-bucket` bucket. Same MinIO server, credentials and
+connection pool, different namespace. The bucket is created lazily.
 """
 
 from app.persistence.blob import MinIOClient
@@ -15,7 +15,6 @@ class ReactiveMinIOClient(MinIOClient):
     def __init__(self):
         super().__init__()
         self.bucket = settings.reactive_minio_bucket
-        self._ensure_bucket()
 
 
 reactive_minio_client = ReactiveMinIOClient()
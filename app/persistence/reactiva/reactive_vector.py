@@ -1,8 +1,8 @@
 """Qdrant manager for the reactive domain — isolated collection.
 
 Inherits all methods from QdrantManager but points to the
-`reactive_documents` collection. Same Qdrant host and client,
-different namespace.
+`reactive_documents` collection. Same Qdrant host and pooled client,
+different namespace (its collection-ready state is tracked separately).
 """
 
 from app.persistence.vector import QdrantManager
@@ -12,7 +12,10 @@ from app.core.config import settings
 class ReactiveQdrantManager(QdrantManager):
     """Qdrant wrapper for the reactive domain — isolated collection."""
 
-    def __init__(self):
-        super().__init__()
+    # Reactive documents are scoped by tenant, not by user
+    tenant_field = "metadata.tenant_id"
+    keyword_index_fields = ("metadata.tenant_id", "metadata.knowledge_base_id", "metadata.doc_id")
+
+    def __init__(self, client=None):
+        super().__init__(client)
         self.collection_name = settings.reactive_qdrant_collection
-        self._initialized = False  # Force re-check for the reactive collection
@@ -1,37 +1,161 @@
 # app/persistence/vector.py
 from qdrant_client import AsyncQdrantClient
-from qdrant_client.http.models import PointStruct, Filter, FieldCondition, MatchValue
+from qdrant_client.http.models import PointStruct, Filter, FieldCondition, MatchValue, Record
 from app.core.config import settings
 from loguru import logger
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+import asyncio
+import hashlib
+import itertools
+import threading
 import uuid
+import weakref
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Where and how a collection keeps its vectors (RAM vs disk, quantization)."""
+    name: str
+    quantization: Optional[str] = None  # None | "int8" (scalar) | "binary"
+    vectors_on_disk: bool = False       # float32 originals mmapped, only read for rescoring
+    hnsw_on_disk: bool = False
+    sparse_on_disk: bool = False
+    oversampling: float = 1.0           # Quantized candidates per requested result, rescored with the originals
+
+
+COLLECTION_PROFILES = {
+    # float32 vectors, HNSW and sparse index in RAM (~3 KB/vector for 768-d)
+    "memory": CollectionProfile("memory"),
+    # int8 copy in RAM (4x smaller), rescored with on-disk originals
+    "int8": CollectionProfile("int8", quantization="int8", vectors_on_disk=True, oversampling=2.0),
+    # 1 bit/dimension in RAM (32x smaller); needs more oversampling to keep recall
+    "binary": CollectionProfile("binary", quantization="binary", vectors_on_disk=True, oversampling=3.0),
+    # Everything mmapped: RAM is only the OS page cache
+    "disk": CollectionProfile("disk", vectors_on_disk=True, hnsw_on_disk=True, sparse_on_disk=True),
+}
+
+
+def get_collection_profile(name: str) -> CollectionProfile:
+    try:
+        return COLLECTION_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown Qdrant collection profile '{name}' (expected one of: {', '.join(COLLECTION_PROFILES)})"
+        ) from None
+
+
+_clients: dict[tuple, AsyncQdrantClient] = {}
+_clients_lock = threading.Lock()
+# Client -> pool key (host, port, transport); injected clients get a never-reused key
+_client_keys: weakref.WeakKeyDictionary[AsyncQdrantClient, tuple] = weakref.WeakKeyDictionary()
+_injected_ids = itertools.count()
+# (pool key, collection) pairs already checked / created / migrated in this process
+_ready_collections: set[tuple[tuple, str]] = set()
+_collection_locks: dict[tuple[tuple, str], asyncio.Lock] = {}
+
+
+def get_qdrant_client(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    prefer_grpc: Optional[bool] = None,
+) -> AsyncQdrantClient:
+    """Process-wide AsyncQdrantClient per host / port / transport (defaults from settings)."""
+    host = host or settings.qdrant_host
+    port = port or settings.qdrant_port
+    prefer_grpc = settings.qdrant_prefer_grpc if prefer_grpc is None else prefer_grpc
+    key = (host, port, settings.qdrant_grpc_port if prefer_grpc else None)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = AsyncQdrantClient(
+                host=host,
+                port=port,
+                grpc_port=settings.qdrant_grpc_port,
+                prefer_grpc=prefer_grpc,
+            )
+            _clients[key] = client
+            _client_keys[client] = key
+            logger.info(f"[Qdrant] Client opened for {host}:{port} ({'gRPC' if prefer_grpc else 'REST'})")
+        return client
+
+
+def _pool_key(client: AsyncQdrantClient) -> tuple:
+    """Identity of a client that outlives it (unlike `id()`, which is reused once it is freed)."""
+    with _clients_lock:
+        key = _client_keys.get(client)
+        if key is None:
+            key = ("injected", next(_injected_ids))
+            _client_keys[client] = key
+        return key
+
+
+async def close_qdrant_clients() -> None:
+    """Close every pooled client (application shutdown)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    _ready_collections.clear()
+    for client in clients:
+        await client.close()
+
 
 class QdrantManager:
-    def __init__(self):
-        self.client = AsyncQdrantClient(host=settings.qdrant_host, port=settings.qdrant_port)
+    # Payload fields every search / scroll / delete filters on (keyword indexes).
+    # `tenant_field` scopes every query: with tenant partitioning its index gets
+    # `is_tenant` and the HNSW graph is built per tenant value.
+    tenant_field = "metadata.user_id"
+    keyword_index_fields = ("metadata.user_id", "metadata.knowledge_base_id", "metadata.doc_id")
+    # Range-indexed integer fields; `metadata.chunk_index` backs the ordered scroll
+    integer_index_fields = ("metadata.chunk_index",)
+
+    def __init__(self, client: Optional[AsyncQdrantClient] = None):
+        # Lightweight view: the client and the collection-ready state are process-wide
+        self.client = client or get_qdrant_client()
         self.collection_name = settings.qdrant_collection
-        self._initialized = False
+        self.profile = get_collection_profile(settings.qdrant_collection_profile)
+
+    @property
+    def _collection_key(self) -> tuple[tuple, str]:
+        return (_pool_key(self.client), self.collection_name)
+
+    @property
+    def _initialized(self) -> bool:
+        return self._collection_key in _ready_collections
+
+    @_initialized.setter
+    def _initialized(self, value: bool) -> None:
+        if value:
+            _ready_collections.add(self._collection_key)
+        else:
+            _ready_collections.discard(self._collection_key)
 
     async def _ensure_collection(self):
         if self._initialized: return
+        # One check / create / index migration per collection, however many managers race here
+        lock = _collection_locks.setdefault(self._collection_key, asyncio.Lock())
+        async with lock:
+            if self._initialized: return
+            await self._create_collection()
+
+    async def _create_collection(self):
         try:
-            from qdrant_client.http import models
             exists = await self.client.collection_exists(self.collection_name)
             if not exists:
                 await self.client.create_collection(
                     collection_name=self.collection_name,
-                    vectors_config={
-                        "dense": models.VectorParams(
-                            size=768, # Ajustar si el modelo cambia
-                            distance=models.Distance.COSINE
-                        )
-                    },
-                    sparse_vectors_config={
-                        "sparse": models.SparseVectorParams(
-                            index=models.SparseIndexParams(on_disk=False)
-                        )
-                    }
+                    vectors_config=self._vectors_config(),
+                    sparse_vectors_config=self._sparse_vectors_config(),
+                    hnsw_config=self._hnsw_config(),
+                    quantization_config=self._quantization_config()
+                )
+                logger.info(
+                    f"Collection '{self.collection_name}' created with hybrid config "
+                    f"(profile: {self.profile.name})"
                 )
-                logger.info(f"Collection '{self.collection_name}' created with hybrid config")
+            if settings.qdrant_payload_indexes:
+                # New collections are empty (instant); existing ones are migrated in the background
+                await self.ensure_payload_indexes(wait=not exists)
             self._initialized = True
         except Exception as e:
             error_msg = str(e).lower()
@@ -42,6 +166,114 @@ class QdrantManager:
                 logger.error(f"Failed to check/create collection: {e}")
                 raise e
 
+    def _vectors_config(self) -> dict:
+        from qdrant_client.http import models
+        return {
+            "dense": models.VectorParams(
+                size=768, # Ajustar si el modelo cambia
+                distance=models.Distance.COSINE,
+                on_disk=self.profile.vectors_on_disk
+            )
+        }
+
+    def _sparse_vectors_config(self) -> dict:
+        from qdrant_client.http import models
+        return {
+            "sparse": models.SparseVectorParams(
+                index=models.SparseIndexParams(on_disk=self.profile.sparse_on_disk or settings.qdrant_sparse_on_disk)
+            )
+        }
+
+    def _quantization_config(self):
+        from qdrant_client.http import models
+        if self.profile.quantization == "int8":
+            # quantile clips outliers so the int8 range covers 99% of component values
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+            )
+        if self.profile.quantization == "binary":
+            return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def _hnsw_config(self):
+        from qdrant_client.http import models
+        if not (settings.qdrant_tenant_partitioning or self.profile.hnsw_on_disk):
+            return None
+        config = models.HnswConfigDiff(on_disk=self.profile.hnsw_on_disk or None)
+        if settings.qdrant_tenant_partitioning:
+            # One graph per tenant value (payload_m) and no global graph (m=0): every
+            # query filters by tenant, so cross-tenant links are never traversed.
+            config.payload_m = 16
+            config.m = 0
+        return config
+
+    def dense_search_params(self):
+        """Search params for the dense branch: quantized search rescored with the originals."""
+        from qdrant_client.http import models
+        if self.profile.quantization is None:
+            return None
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(rescore=True, oversampling=self.profile.oversampling)
+        )
+
+    async def apply_collection_profile(self) -> None:
+        """Move an existing collection to the configured profile (Qdrant rebuilds in the background)."""
+        from qdrant_client.http import models
+        await self.client.update_collection(
+            collection_name=self.collection_name,
+            vectors_config={"dense": models.VectorParamsDiff(on_disk=self.profile.vectors_on_disk)},
+            sparse_vectors_config=self._sparse_vectors_config(),
+            hnsw_config=models.HnswConfigDiff(on_disk=self.profile.hnsw_on_disk),
+            quantization_config=self._quantization_config() or models.Disabled.DISABLED
+        )
+        logger.info(f"[Qdrant] '{self.collection_name}': profile set to {self.profile.name}")
+
+    def _index_schema(self, field_name: str):
+        from qdrant_client.http import models
+        if field_name in self.integer_index_fields:
+            return models.PayloadSchemaType.INTEGER
+        if field_name == self.tenant_field and settings.qdrant_tenant_partitioning:
+            return models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD, is_tenant=True)
+        return models.PayloadSchemaType.KEYWORD
+
+    async def ensure_payload_indexes(self, wait: bool = True) -> list[str]:
+        """
+        Create the missing keyword / integer payload indexes (and switch the tenant index to
+        `is_tenant` when partitioning is enabled). Idempotent: doubles as the
+        migration for collections created before indexes existed.
+
+        Returns the fields whose index was created or rebuilt.
+        """
+        info = await self.client.get_collection(self.collection_name)
+        existing = info.payload_schema or {}
+        changed = []
+        for field_name in (*self.keyword_index_fields, *self.integer_index_fields):
+            schema = self._index_schema(field_name)
+            current = existing.get(field_name)
+            if current is not None:
+                wants_tenant = getattr(schema, "is_tenant", None) is True
+                is_tenant = getattr(current.params, "is_tenant", None) is True
+                if wants_tenant == is_tenant:
+                    continue
+                # Index params cannot be altered in place
+                await self.client.delete_payload_index(self.collection_name, field_name, wait=True)
+            await self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=schema,
+                # order_by scrolls fail until the integer index exists: always wait for those
+                wait=wait or field_name in self.integer_index_fields
+            )
+            changed.append(field_name)
+
+        if settings.qdrant_tenant_partitioning and info.config.hnsw_config.payload_m is None:
+            await self.client.update_collection(self.collection_name, hnsw_config=self._hnsw_config())
+            changed.append("hnsw_config")
+
+        if changed:
+            logger.info(f"[Qdrant] '{self.collection_name}': payload indexes updated ({', '.join(changed)})")
+        return changed
+
     async def upsert(self, points: list[PointStruct]):
         await self._ensure_collection()
         valid_points = []
@@ -56,6 +288,15 @@ class QdrantManager:
             wait=True
         )
 
+    async def upsert_points(self, points: list[PointStruct], wait: bool = True):
+        """Upsert points as given (ids are not validated); `wait=False` returns once Qdrant has them in its WAL."""
+        await self._ensure_collection()
+        await self.client.upsert(
+            collection_name=self.collection_name,
+            points=points,
+            wait=wait
+        )
+
     async def search(self, query=None, limit=5, filter_dict=None, prefetch=None):
         await self._ensure_collection()
         # Usamos query_points (Query API v1.10+) para soportar Fusion/Prefetch.
@@ -70,41 +311,159 @@ class QdrantManager:
         )
         return result.points
 
-    async def get_document_chunks(self, doc_id: str, user_id: str, max_chunks: int = 500):
+    async def search_batch(self, requests: list):
+        """Run several QueryRequests in one round trip; returns one list of points per request."""
+        await self._ensure_collection()
+        responses = await self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=requests
+        )
+        return [response.points for response in responses]
+
+    async def iter_document_chunks(
+        self, doc_id: str, user_id: str, page_size: int = 256
+    ) -> AsyncIterator[Record]:
+        """
+        Yield every chunk of a document in `chunk_index` order, one scroll page at a time.
+
+        Uses Qdrant's `order_by` on the range-indexed `metadata.chunk_index` (which does
+        not support offsets), paginating with a `chunk_index >= last seen` filter and
+        skipping the points already yielded at that index, so chunks sharing an index
+        across a page boundary are not lost.
+        Without payload indexes it falls back to an unordered scroll sorted in memory.
+        """
+        await self._ensure_collection()
+        from qdrant_client.http import models
+        document = [
+            FieldCondition(key="metadata.doc_id", match=MatchValue(value=doc_id)),
+            FieldCondition(key=self.tenant_field, match=MatchValue(value=user_id)),
+        ]
+
+        if not settings.qdrant_payload_indexes:
+            logger.warning("[Qdrant] Payload indexes disabled: document chunks are sorted in memory")
+            records, offset = [], None
+            while True:
+                page, offset = await self.client.scroll(
+                    collection_name=self.collection_name,
+                    scroll_filter=Filter(must=document),
+                    limit=page_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False
+                )
+                records.extend(page)
+                if offset is None:
+                    break
+            records.sort(key=lambda r: r.payload.get("metadata", {}).get("chunk_index", 0))
+            for record in records:
+                yield record
+            return
+
+        def chunk_index(record: Record) -> int:
+            return record.payload["metadata"]["chunk_index"]
+
+        last_index = None
+        seen_at_last: set = set()  # ids already yielded whose chunk_index == last_index
+        while True:
+            conditions = list(document)
+            if last_index is not None:
+                conditions.append(FieldCondition(key="metadata.chunk_index", range=models.Range(gte=last_index)))
+            page, _ = await self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=Filter(must=conditions),
+                limit=page_size,
+                order_by=models.OrderBy(key="metadata.chunk_index", direction=models.Direction.ASC),
+                with_payload=True,
+                with_vectors=False
+            )
+            fresh = [r for r in page if not (chunk_index(r) == last_index and r.id in seen_at_last)]
+            for record in fresh:
+                yield record
+            # A page without new points means more than page_size share one chunk_index
+            if len(page) < page_size or not fresh:
+                break
+            if chunk_index(page[-1]) != last_index:
+                last_index, seen_at_last = chunk_index(page[-1]), set()
+            seen_at_last.update(r.id for r in page if chunk_index(r) == last_index)
+
+    async def get_document_chunk_hashes(self, doc_id: str, user_id: str) -> dict[str, list[tuple[str, dict]]]:
+        """Map chunk_hash -> [(point_id, metadata)] for every stored chunk of a document.
+
+        Chunks ingested before hashes were stored are hashed from their payload text.
+        """
         await self._ensure_collection()
         filter_dict = Filter(
             must=[
-                FieldCondition(
-                    key="metadata.doc_id",
-                    match=MatchValue(value=doc_id)
-                ),
-                FieldCondition(
-                    key="metadata.user_id",
-                    match=MatchValue(value=user_id)
-                )
+                FieldCondition(key="metadata.doc_id", match=MatchValue(value=doc_id)),
+                FieldCondition(key=self.tenant_field, match=MatchValue(value=user_id)),
             ]
         )
 
-        # Paginate through all chunks with a memory safety limit
-        all_results = []
+        hashes: dict[str, list[tuple[str, dict]]] = {}
         offset = None
         while True:
-            results, next_offset = await self.client.scroll(
+            results, offset = await self.client.scroll(
                 collection_name=self.collection_name,
                 scroll_filter=filter_dict,
-                limit=100,
+                limit=256,
                 offset=offset,
                 with_payload=True,
                 with_vectors=False
             )
-            all_results.extend(results)
-            if next_offset is None or len(all_results) >= max_chunks:
+            for record in results:
+                metadata = record.payload.get("metadata", {})
+                chunk_hash = metadata.get("chunk_hash") or hashlib.sha256(
+                    record.payload.get("text", "").encode("utf-8")
+                ).hexdigest()
+                hashes.setdefault(chunk_hash, []).append((str(record.id), metadata))
+            if offset is None:
                 break
-            offset = next_offset
-        return all_results[:max_chunks]
+        return hashes
+
+    async def get_document_metadata(self, doc_id: str, user_id: str) -> Optional[dict]:
+        """Metadata of one stored chunk of a document, or None if the owner has no such document."""
+        await self._ensure_collection()
+        records, _ = await self.client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=Filter(
+                must=[
+                    FieldCondition(key="metadata.doc_id", match=MatchValue(value=doc_id)),
+                    FieldCondition(key=self.tenant_field, match=MatchValue(value=user_id)),
+                ]
+            ),
+            limit=1,
+            with_payload=True,
+            with_vectors=False
+        )
+        return records[0].payload.get("metadata", {}) if records else None
+
+    async def set_chunk_metadata(self, updates: list[tuple[str, dict]]):
+        """Replace the `metadata` payload of existing points in a single batch request."""
+        await self._ensure_collection()
+        from qdrant_client.http import models
+        await self.client.batch_update_points(
+            collection_name=self.collection_name,
+            update_operations=[
+                models.SetPayloadOperation(
+                    set_payload=models.SetPayload(payload={"metadata": metadata}, points=[point_id])
+                )
+                for point_id, metadata in updates
+            ],
+            wait=True
+        )
 
-    async def delete_document(self, doc_id: str, user_id: str):
+    async def delete_points(self, point_ids: list[str]):
         await self._ensure_collection()
+        from qdrant_client.http import models
+        await self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.PointIdsList(points=point_ids)
+        )
+
+    async def delete_document(self, doc_id: str, user_id: str, keep_ids: Optional[list[str]] = None):
+        """Delete every point of a document, except `keep_ids` if given (revision rollback)."""
+        await self._ensure_collection()
+        from qdrant_client.http import models
         filter_dict = Filter(
             must=[
                 FieldCondition(
@@ -112,17 +471,21 @@ class QdrantManager:
                     match=MatchValue(value=doc_id)
                 ),
                 FieldCondition(
-                    key="metadata.user_id",
+                    key=self.tenant_field,
                     match=MatchValue(value=user_id)
                 )
-            ]
+            ],
+            must_not=[models.HasIdCondition(has_id=keep_ids)] if keep_ids else None
         )
         
         await self.client.delete(
             collection_name=self.collection_name,
             points_selector=filter_dict
         )
-        logger.info(f"Document {doc_id} deleted from Qdrant")
+        if keep_ids:
+            logger.info(f"Document {doc_id}: points outside the {len(keep_ids)} kept ones deleted from Qdrant")
+        else:
+            logger.info(f"Document {doc_id} deleted from Qdrant")
 
     @staticmethod
     def _is_valid_uuid(val):
@@ -0,0 +1,151 @@
+"""
+Bulk point writer for Qdrant.
+
+Buffers points into batches bounded by point count and estimated request size,
+sends up to `parallelism` batches at a time with `wait=False` (Qdrant acks once
+the batch is in its WAL, before indexing), and blocks `submit()` while that many
+batches are in flight — the backpressure that keeps ingestion memory bounded.
+`flush()` sends the remainder, waits for every request and then issues a
+barrier: the last point is re-sent with `wait=True`. Qdrant applies updates in
+order only within a shard, so the barrier guarantees every earlier batch is
+applied and searchable only on single-shard collections (what QdrantManager
+creates). With several shards it waits for the barrier point's shard alone;
+the other shards catch up asynchronously.
+"""
+
+import asyncio
+import json
+import time
+from typing import Optional
+
+from loguru import logger
+from qdrant_client.http.models import PointStruct
+
+from app.core.config import settings
+
+
+def estimate_point_bytes(point: PointStruct, grpc: bool = False) -> int:
+    """Approximate serialized size of a point (JSON floats ~20 chars, protobuf 4 bytes)."""
+    per_float = 4 if grpc else 20
+    size = 64
+    for vector in (point.vector or {}).values():
+        if hasattr(vector, "indices"):
+            size += len(vector.indices) * (per_float + (4 if grpc else 8))
+        else:
+            size += len(vector) * per_float
+    if point.payload:
+        size += len(json.dumps(point.payload, ensure_ascii=False, default=str).encode("utf-8"))
+    return size
+
+
+class BulkWriter:
+    """
+    Size-bounded, parallel, non-blocking upserts into one collection.
+
+    Point ids are sent as given (no per-point UUID validation): callers build
+    them with uuid4(). Use one writer per ingestion run, and always `flush()`.
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        max_batch_points: Optional[int] = None,
+        max_batch_bytes: Optional[int] = None,
+        parallelism: Optional[int] = None,
+    ):
+        self.vector_store = vector_store
+        self.max_batch_points = max(1, max_batch_points or settings.qdrant_upsert_batch_points)
+        self.max_batch_bytes = max(1, max_batch_bytes or settings.qdrant_upsert_max_bytes)
+        self.parallelism = max(1, parallelism or settings.qdrant_upsert_parallelism)
+        self._grpc = settings.qdrant_prefer_grpc
+        self._slots = asyncio.Semaphore(self.parallelism)
+        self._in_flight: set[asyncio.Task] = set()
+        self._buffer: list[PointStruct] = []
+        self._buffer_bytes = 0
+        self._last_point: Optional[PointStruct] = None
+        self._error: Optional[BaseException] = None
+        self._started: Optional[float] = None
+        self.points = 0
+        self.batches = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    async def submit(self, points: list[PointStruct]) -> None:
+        """Queue points; full batches are sent right away (blocks while `parallelism` are in flight)."""
+        self._raise_if_failed()
+        if self._started is None:
+            self._started = time.perf_counter()
+        for point in points:
+            size = estimate_point_bytes(point, self._grpc)
+            if self._buffer and (
+                len(self._buffer) >= self.max_batch_points
+                or self._buffer_bytes + size > self.max_batch_bytes
+            ):
+                await self._send()
+            self._buffer.append(point)
+            self._buffer_bytes += size
+
+    async def flush(self) -> None:
+        """Send the remainder, wait for all batches and apply the consistency barrier."""
+        if self._buffer:
+            await self._send()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        self._raise_if_failed()
+        if self._last_point is not None:
+            await self.vector_store.upsert_points([self._last_point], wait=True)
+            self._last_point = None
+        if self._started is not None:
+            self.seconds = time.perf_counter() - self._started
+            logger.info(
+                f"[BulkWriter] {self.points} points in {self.batches} batches "
+                f"({self.bytes / 1e6:.1f} MB) — {self.points_per_second:.0f} points/s"
+            )
+
+    async def aclose(self) -> None:
+        """Cancel pending batches (error path; `flush()` is the normal end)."""
+        for task in self._in_flight:
+            task.cancel()
+        await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def _send(self) -> None:
+        batch, size = self._buffer, self._buffer_bytes
+        self._buffer, self._buffer_bytes = [], 0
+        await self._slots.acquire()
+        self._raise_if_failed(release=True)
+        task = asyncio.create_task(self._upsert(batch, size))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _upsert(self, batch: list[PointStruct], size: int) -> None:
+        try:
+            await self.vector_store.upsert_points(batch, wait=False)
+            self.points += len(batch)
+            self.batches += 1
+            self.bytes += size
+            self._last_point = batch[-1]
+        except Exception as e:
+            logger.error(f"[BulkWriter] Batch of {len(batch)} points failed: {e}")
+            if self._error is None:
+                self._error = e
+        finally:
+            self._slots.release()
+
+    def _raise_if_failed(self, release: bool = False) -> None:
+        if self._error is not None:
+            if release:
+                self._slots.release()
+            raise self._error
+
+    @property
+    def points_per_second(self) -> float:
+        return self.points / self.seconds if self.seconds > 0 else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "points": self.points,
+            "batches": self.batches,
+            "megabytes": round(self.bytes / 1e6, 2),
+            "seconds": round(self.seconds, 3),
+            "points_per_sec": round(self.points_per_second, 1),
+        }
@@ -0,0 +1,328 @@
+"""
+Ingestion benchmark: synthetic industrial corpus through the real pipelines.
+
+Generates PDF / DOCX / JSON documents of configurable size, runs them through
+DocumentProcessor and/or ReactiveDocumentProcessor (load → split → embed →
+upsert) against an in-memory Qdrant (or a local one with --qdrant-url), and
+reports per-stage latency percentiles, throughput and peak RSS.
+
+    uv run python -m scripts.bench_ingestion --docs 6 --pages 40
+    uv run python -m scripts.bench_ingestion --embedder hash --json bench.json   # no model inference
+
+`--embedder hash` swaps the ONNX models for deterministic hash vectors so the
+loader / splitter / Qdrant path can be measured on machines without the models.
+The embedding cache is disabled unless --cache is given, so runs are comparable.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+# Settings without defaults — benchmarks never reach MinIO/Postgres
+for key, value in {
+    "QDRANT_HOST": "localhost",
+    "QDRANT_PORT": "6333",
+    "MINIO_ENDPOINT": "localhost:9000",
+    "MINIO_ACCESS_KEY": "bench",
+    "MINIO_SECRET_KEY": "bench",
+    "MINIO_BUCKET": "bench",
+    "MINIO_SECURE": "false",
+    "SECRET_KEY": "bench",
+}.items():
+    os.environ.setdefault(key, value)
+
+_WORDS = (
+    "bomba válvula presión caudal motor rodamiento temperatura sensor alarma "
+    "mantenimiento lubricación inspección torque voltaje corriente fase turbina "
+    "compresor filtro sello eje acoplamiento vibración calibración procedimiento"
+).split()
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus
+# ---------------------------------------------------------------------------
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _page_lines(rng: random.Random, page: int) -> list[str]:
+    lines = [f"{page}. {rng.choice(_WORDS).upper()} {rng.choice(_WORDS).upper()}"]
+    for sub in range(1, rng.randint(2, 4)):
+        lines.append(f"{page}.{sub} {rng.choice(_WORDS).capitalize()} del equipo")
+        lines.extend(_paragraph(rng, rng.randint(30, 70)) for _ in range(rng.randint(2, 4)))
+    return lines
+
+
+def build_pdf(path: Path, pages: int, rng: random.Random, table_every: int = 4) -> None:
+    import pymupdf
+
+    pdf = pymupdf.open()
+    for number in range(1, pages + 1):
+        page = pdf.new_page()
+        box = pymupdf.Rect(50, 50, page.rect.width - 50, page.rect.height - 50)
+        lines = _page_lines(rng, number)
+        if number % table_every == 0:
+            box.y1 = 520
+            # Ruled spec table below the text
+            for row in range(6):
+                for col in range(4):
+                    cell = pymupdf.Rect(60 + col * 120, 540 + row * 22, 180 + col * 120, 562 + row * 22)
+                    page.draw_rect(cell)
+                    label = "Parámetro" if row == 0 else f"{rng.randint(1, 999)} {rng.choice(('bar', 'rpm', 'A'))}"
+                    page.insert_text((cell.x0 + 4, cell.y1 - 7), label, fontsize=9)
+        # insert_textbox writes nothing on overflow: drop trailing lines until it fits
+        while lines and page.insert_textbox(box, "\n".join(lines), fontsize=9) < 0:
+            lines.pop()
+    pdf.save(str(path))
+    pdf.close()
+
+
+def build_docx(path: Path, pages: int, rng: random.Random) -> None:
+    """Minimal WordprocessingML package — enough for docx2txt."""
+    paragraphs = [line for page in range(1, pages + 1) for line in _page_lines(rng, page)]
+    body = "".join(f"<w:p><w:r><w:t>{escape(p)}</w:t></w:r></w:p>" for p in paragraphs)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        ))
+        docx.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="word/document.xml" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+            '</Relationships>'
+        ))
+        docx.writestr("word/document.xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{body}</w:body></w:document>'
+        ))
+
+
+def build_json(path: Path, pages: int, rng: random.Random) -> None:
+    records = [
+        {
+            "tag": f"EQ-{i:05d}",
+            "equipo": rng.choice(_WORDS),
+            "area": f"Planta {rng.randint(1, 6)}",
+            "lecturas": {w: round(rng.uniform(0, 500), 2) for w in rng.sample(_WORDS, 4)},
+            "notas": _paragraph(rng, rng.randint(10, 30)),
+        }
+        for i in range(pages * 8)
+    ]
+    path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+
+
+_BUILDERS = {"pdf": build_pdf, "docx": build_docx, "json": build_json}
+
+
+def build_corpus(directory: Path, formats: list[str], docs: int, pages: int, seed: int) -> list[Path]:
+    rng = random.Random(seed)
+    files = []
+    for i in range(docs):
+        fmt = formats[i % len(formats)]
+        path = directory / f"manual_{i:03d}.{fmt}"
+        _BUILDERS[fmt](path, pages, rng)
+        files.append(path)
+    return files
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+def make_hash_embedder():
+    """Embedder with the ONNX models replaced by deterministic hash vectors."""
+    import hashlib
+
+    import numpy as np
+    from fastembed import SparseEmbedding
+
+    from app.domain.shared.ingestion.embedder import Embedder
+
+    class HashEmbedder(Embedder):
+        def __init__(self):
+            super().__init__()  # models stay unloaded: the batch methods below never touch them
+            self.cache = None
+
+        def _dense_batch(self, texts):
+            vectors = []
+            for text in texts:
+                seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+                vector = np.random.default_rng(seed).standard_normal(768).astype(np.float32)
+                vectors.append((vector / np.linalg.norm(vector)).tolist())
+            return vectors
+
+        def _sparse_batch(self, texts):
+            result = []
+            for text in texts:
+                tokens = sorted({int(hashlib.md5(w.encode()).hexdigest()[:6], 16) for w in text.lower().split()})
+                result.append(SparseEmbedding(
+                    indices=np.array(tokens, dtype=np.int32),
+                    values=np.ones(len(tokens), dtype=np.float32),
+                ))
+            return result
+
+    return HashEmbedder()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def peak_rss_mb() -> dict[str, float]:
+    # ru_maxrss is KiB on Linux; children = PDF extraction worker processes
+    return {
+        "main": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "workers": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+
+
+async def run_pipeline(name: str, processor, files: list[Path], rounds: int) -> dict:
+    runs = []
+    for round_number in range(rounds):
+        for path in files:
+            started = time.perf_counter()
+            if name == "proactiva":
+                result = await processor.process_file(path, user_id="bench", knowledge_base_id="bench")
+            else:
+                result = await processor.process_file(path, tenant_id="bench", knowledge_base_id="bench")
+            runs.append({
+                "file": path.name,
+                "round": round_number,
+                "wall": time.perf_counter() - started,
+                "chunks": result["chunks"],
+                "stages": result["stages"],
+            })
+    return summarize(name, runs)
+
+
+def summarize(name: str, runs: list[dict]) -> dict:
+    wall = [run["wall"] for run in runs]
+    chunks = sum(run["chunks"] for run in runs)
+    stages = {}
+    for stage in ("load", "split", "embed", "upsert"):
+        seconds = [run["stages"][stage]["seconds"] for run in runs]
+        items = sum(run["stages"][stage]["items"] for run in runs)
+        stages[stage] = {
+            "p50_s": round(percentile(seconds, 50), 4),
+            "p95_s": round(percentile(seconds, 95), 4),
+            "max_s": round(max(seconds), 4),
+            "items": items,
+            "items_per_sec": round(items / sum(seconds), 2) if sum(seconds) else 0.0,
+        }
+    return {
+        "pipeline": name,
+        "documents": len(runs),
+        "chunks": chunks,
+        "wall_p50_s": round(percentile(wall, 50), 4),
+        "wall_p95_s": round(percentile(wall, 95), 4),
+        "wall_total_s": round(sum(wall), 3),
+        "chunks_per_sec": round(chunks / sum(wall), 2) if sum(wall) else 0.0,
+        "stages": stages,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n== {report['pipeline']}: {report['documents']} docs, {report['chunks']} chunks, "
+          f"{report['chunks_per_sec']} chunks/s end-to-end "
+          f"(doc p50 {report['wall_p50_s']}s, p95 {report['wall_p95_s']}s)")
+    print(f"   {'stage':<8}{'p50 s':>10}{'p95 s':>10}{'max s':>10}{'items':>10}{'items/s':>12}")
+    for stage, row in report["stages"].items():
+        print(f"   {stage:<8}{row['p50_s']:>10}{row['p95_s']:>10}{row['max_s']:>10}"
+              f"{row['items']:>10}{row['items_per_sec']:>12}")
+
+
+async def main(args) -> int:
+    if not args.cache:
+        os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+
+    from loguru import logger
+    from qdrant_client import AsyncQdrantClient
+
+    from app.domain.proactiva.ingestion.pipeline import DocumentProcessor
+    from app.domain.reactiva.ingestion.reactive_pipeline import ReactiveDocumentProcessor
+    from app.domain.shared.ingestion.embedder import Embedder
+    from app.persistence.reactiva.reactive_vector import ReactiveQdrantManager
+    from app.persistence.vector import QdrantManager
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(_BUILDERS)
+    if unknown:
+        print(f"Unknown formats: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    client = AsyncQdrantClient(url=args.qdrant_url) if args.qdrant_url else AsyncQdrantClient(location=":memory:")
+    embedder = make_hash_embedder() if args.embedder == "hash" else Embedder()
+
+    reports = []
+    with tempfile.TemporaryDirectory(prefix="bench_ingestion_") as tmp:
+        started = time.perf_counter()
+        files = build_corpus(Path(tmp), formats, args.docs, args.pages, args.seed)
+        size_mb = sum(f.stat().st_size for f in files) / 1e6
+        print(f"Corpus: {len(files)} files ({', '.join(formats)}), {args.pages} pages each, "
+              f"{size_mb:.1f} MB, built in {time.perf_counter() - started:.1f}s")
+
+        pipelines = ["proactiva", "reactiva"] if args.pipeline == "both" else [args.pipeline]
+        for name in pipelines:
+            store = QdrantManager() if name == "proactiva" else ReactiveQdrantManager()
+            store.client = client
+            store.collection_name = f"bench_{name}"
+            processor_cls = DocumentProcessor if name == "proactiva" else ReactiveDocumentProcessor
+            processor = processor_cls(embedder=embedder, vector_store=store)
+            report = await run_pipeline(name, processor, files, args.rounds)
+            print_report(report)
+            reports.append(report)
+
+    rss = peak_rss_mb()
+    print(f"\nPeak RSS: {rss['main']:.0f} MB main, {rss['workers']:.0f} MB largest PDF worker")
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "args": vars(args),
+            "pipelines": reports,
+            "peak_rss_mb": {k: round(v, 1) for k, v in rss.items()},
+        }, indent=2))
+        print(f"Report written to {args.json}")
+    await client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pipeline", choices=("proactiva", "reactiva", "both"), default="both")
+    parser.add_argument("--formats", default="pdf,docx,json", help="Comma-separated: pdf, docx, json")
+    parser.add_argument("--docs", type=int, default=6, help="Documents in the corpus (formats round-robin)")
+    parser.add_argument("--pages", type=int, default=40, help="Pages per document (JSON: 8 records per page)")
+    parser.add_argument("--rounds", type=int, default=1, help="Times each document is ingested")
+    parser.add_argument("--embedder", choices=("model", "hash"), default="model")
+    parser.add_argument("--qdrant-url", default=None, help="Local Qdrant (default: in-memory)")
+    parser.add_argument("--cache", action="store_true", help="Keep the embedding cache enabled")
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--json", default=None, help="Write the report as JSON to this path")
+    parser.add_argument("--log-level", default="WARNING")
+    sys.exit(asyncio.run(main(parser.parse_args())))
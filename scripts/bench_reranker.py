@@ -0,0 +1,196 @@
+"""
+Reranker backend benchmark: latency and ranking agreement with the fp32 model.
+
+Scores the same eval set with each backend (torch fp32 CrossEncoder, ONNX fp32,
+ONNX int8) and reports per-query latency percentiles, pairs/s, NDCG@k of each
+backend's ranking against the torch fp32 ranking, top-1 agreement and, when
+the eval set has labels, NDCG@k against the labels.
+
+It also replays adaptive reranking (settings.rerank_batch_size / rerank_margin)
+over each backend's scores, taking the eval set's passage order as the
+first-stage order: the share of pairs it would score and how often its top-k
+matches full scoring. The run fails if the cutoff never fires.
+
+Eval set (JSONL, one query per line):
+    {"query": "...", "passages": ["...", ...], "relevance": [2, 0, 1, ...]}   # relevance optional
+
+Usage:
+    uv run python -m scripts.bench_reranker --eval data/rerank_eval.jsonl
+    uv run python -m scripts.bench_reranker --synthetic 50 --backends torch,onnx-int8
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.domain.shared.model_registry import get_model_registry
+from app.domain.shared.retrieval.reranker import Reranker
+
+_WORDS = (
+    "bomba válvula presión caudal motor rodamiento temperatura sensor alarma "
+    "mantenimiento lubricación inspección torque voltaje corriente fase turbina "
+    "compresor filtro sello eje acoplamiento vibración calibración procedimiento"
+).split()
+
+
+def load_eval(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def synthetic_eval(queries: int, passages: int, seed: int = 11) -> list[dict]:
+    """Queries with passages of graded word overlap — agreement/latency only, not quality.
+
+    Passages come roughly in descending overlap, like a first-stage (RRF) candidate list.
+    """
+    rng = random.Random(seed)
+    items = []
+    for _ in range(queries):
+        terms = rng.sample(_WORDS, 3)
+        query = f"¿Cuál es el procedimiento de {terms[0]} para {terms[1]} con {terms[2]}?"
+        filler = [w for w in _WORDS if w not in terms]  # so overlap is exactly `overlap` terms
+        candidates = []
+        for _ in range(passages):
+            overlap = rng.randint(0, 3)
+            words = terms[:overlap] + [rng.choice(filler) for _ in range(rng.randint(60, 180))]
+            rng.shuffle(words)
+            candidates.append((overlap + rng.random(), " ".join(words)))
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        items.append({"query": query, "passages": [text for _, text in candidates]})
+    return items
+
+
+def ndcg(order: list[int], relevance: list[float], k: int) -> float:
+    def dcg(indices: list[int]) -> float:
+        return sum(relevance[i] / math.log2(rank + 2) for rank, i in enumerate(indices[:k]))
+
+    ideal = dcg(sorted(range(len(relevance)), key=lambda i: relevance[i], reverse=True))
+    return dcg(order) / ideal if ideal > 0 else 1.0
+
+
+def ranking(scores) -> list[int]:
+    return sorted(range(len(scores)), key=lambda i: float(scores[i]), reverse=True)
+
+
+def reference_relevance(order: list[int], k: int) -> list[float]:
+    """Graded relevance from a reference ranking: top-1 gets k, top-k gets 1, rest 0."""
+    relevance = [0.0] * len(order)
+    for rank, index in enumerate(order[:k]):
+        relevance[index] = float(k - rank)
+    return relevance
+
+
+def replay_adaptive(scores: list[float], k: int, batch_size: int, margin: float) -> int:
+    """Pairs Reranker._score_adaptive would score for this candidate list (same stop rule)."""
+    top_scores: list[float] = []
+    for start in range(0, len(scores), batch_size):
+        batch = scores[start:start + batch_size]
+        top_scores = sorted(top_scores + batch, reverse=True)[:k]
+        if Reranker.cutoff_reached(top_scores, batch, k, margin):
+            return start + len(batch)
+    return len(scores)
+
+
+def run_backend(backend: str, items: list[dict], warmup: int) -> Optional[dict]:
+    model = get_model_registry().cross_encoder(backend=backend)
+    if model is None:
+        print(f"{backend}: not available, skipped")
+        return None
+    for item in items[:warmup]:
+        model.predict([[item["query"], p] for p in item["passages"]])
+
+    latencies, scores = [], []
+    for item in items:
+        pairs = [[item["query"], p] for p in item["passages"]]
+        started = time.perf_counter()
+        scores.append([float(s) for s in model.predict(pairs)])
+        latencies.append(time.perf_counter() - started)
+    return {"latencies": latencies, "scores": scores}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eval", default=None, help="JSONL eval set")
+    parser.add_argument("--synthetic", type=int, default=30, help="Synthetic queries if --eval is not given")
+    parser.add_argument("--passages", type=int, default=20, help="Passages per synthetic query")
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--json", default=None, help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    items = load_eval(args.eval) if args.eval else synthetic_eval(args.synthetic, args.passages)
+    pairs_total = sum(len(item["passages"]) for item in items)
+    print(f"Eval set: {len(items)} queries, {pairs_total} pairs, k={args.k}")
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    results = {b: r for b in backends if (r := run_backend(b, items, args.warmup)) is not None}
+    reference = results.get("torch")
+    if reference is None:
+        print("torch (fp32) reference not available: NDCG vs fp32 is omitted")
+
+    report = {}
+    print(f"\n{'backend':<10}{'p50 ms':>9}{'p95 ms':>9}{'pairs/s':>10}{'NDCG@k fp32':>13}{'top1 agree':>12}"
+          f"{'NDCG@k labels':>15}{'adaptive pairs':>16}{'top-k kept':>12}")
+    for backend, result in results.items():
+        latencies = result["latencies"]
+        row = {
+            "p50_ms": round(statistics.median(latencies) * 1000, 2),
+            "p95_ms": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))] * 1000, 2),
+            "pairs_per_sec": round(pairs_total / sum(latencies), 1),
+            "ndcg_vs_fp32": None,
+            "top1_agreement": None,
+            "ndcg_vs_labels": None,
+        }
+        if reference is not None:
+            ref_orders = [ranking(s) for s in reference["scores"]]
+            orders = [ranking(s) for s in result["scores"]]
+            row["ndcg_vs_fp32"] = round(statistics.mean(
+                ndcg(order, reference_relevance(ref, args.k), args.k) for order, ref in zip(orders, ref_orders)
+            ), 4)
+            row["top1_agreement"] = round(statistics.mean(
+                float(order[0] == ref[0]) for order, ref in zip(orders, ref_orders)
+            ), 4)
+        labelled = [(item, s) for item, s in zip(items, result["scores"]) if item.get("relevance")]
+        if labelled:
+            row["ndcg_vs_labels"] = round(statistics.mean(
+                ndcg(ranking(s), item["relevance"], args.k) for item, s in labelled
+            ), 4)
+
+        # Adaptive replay: prefix the cutoff would score, and whether its top-k equals full scoring's
+        scored = [replay_adaptive(s, args.k, max(1, settings.rerank_batch_size), settings.rerank_margin)
+                  for s in result["scores"]]
+        row["adaptive_pairs"] = round(sum(scored) / pairs_total, 4)
+        row["adaptive_cutoffs"] = sum(n < len(s) for n, s in zip(scored, result["scores"]))
+        row["adaptive_topk_kept"] = round(statistics.mean(
+            float(set(ranking(s[:n])[:args.k]) == set(ranking(s)[:args.k]))
+            for n, s in zip(scored, result["scores"])
+        ), 4)
+        report[backend] = row
+
+        def fmt(value) -> str:
+            return "-" if value is None else str(value)
+
+        print(f"{backend:<10}{row['p50_ms']:>9}{row['p95_ms']:>9}{row['pairs_per_sec']:>10}"
+              f"{fmt(row['ndcg_vs_fp32']):>13}{fmt(row['top1_agreement']):>12}{fmt(row['ndcg_vs_labels']):>15}"
+              f"{row['adaptive_pairs']:>16}{row['adaptive_topk_kept']:>12}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "backends": report}, indent=2))
+        print(f"\nReport written to {args.json}")
+
+    for backend, row in report.items():
+        # The margin must be on the scale the backend returns, or adaptive mode scores everything
+        assert row["adaptive_cutoffs"] > 0, (
+            f"{backend}: rerank_margin={settings.rerank_margin} never stops adaptive reranking early"
+        )
+
+
+if __name__ == "__main__":
+    main()
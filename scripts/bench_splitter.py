@@ -0,0 +1,149 @@
+"""
+Microbenchmark: legacy two-stage splitting vs the single-pass HierarchicalSplitter.
+
+Legacy path = per-line section detection (re.match + "\\n".join per section)
+followed by a RecursiveCharacterTextSplitter pass over every section.
+New path    = HierarchicalSplitter.split_documents(..., chunk_size, chunk_overlap).
+
+Besides timing, both paths report their chunk count and how many chunks are
+wholly contained in the chunk before them; the run fails if the single-pass
+splitter emits duplicates or more than 5% extra chunks.
+
+Usage:
+    uv run python -m scripts.bench_splitter [--pages 400] [--chunk-size 1000] [--overlap 200] [--rounds 5]
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.domain.shared.ingestion.text_splitter import HierarchicalSplitter
+
+_WORDS = (
+    "bomba válvula presión caudal motor rodamiento temperatura sensor alarma "
+    "mantenimiento lubricación inspección torque voltaje corriente fase turbina "
+    "compresor filtro sello eje acoplamiento vibración calibración procedimiento"
+).split()
+
+
+def build_manual(pages: int, seed: int = 7) -> list[Document]:
+    """Synthetic equipment manual: numbered/uppercase sections, long paragraphs, spec lists."""
+    rng = random.Random(seed)
+    docs = []
+    section = 1
+    for page in range(1, pages + 1):
+        lines = []
+        for _ in range(rng.randint(2, 4)):
+            if rng.random() < 0.3:
+                lines.append(f"SECCIÓN {section} {rng.choice(_WORDS).upper()}")
+            else:
+                lines.append(f"{section}.{rng.randint(1, 9)} {rng.choice(_WORDS).capitalize()} del equipo")
+            section += 1
+            for _ in range(rng.randint(2, 6)):
+                lines.append(" ".join(rng.choice(_WORDS) for _ in range(rng.randint(40, 160))))
+                lines.append("")
+            for i in range(rng.randint(0, 8)):
+                lines.append(f"- Parámetro {i}: {rng.randint(1, 500)} {rng.choice(('bar', 'rpm', '°C', 'A'))}")
+        docs.append(Document(
+            page_content="\n".join(lines),
+            metadata={"source": "manual.pdf", "page": page, "total_pages": pages},
+        ))
+    return docs
+
+
+def legacy_sections(documents: list[Document]) -> list[Document]:
+    chunks = []
+    for doc in documents:
+        current_section = ""
+        current_content = []
+        for line in doc.page_content.split("\n"):
+            clean_line = line.strip()
+            is_section_header = (
+                bool(re.match(r"^\d+\.?\d*\.?\s+[A-Za-záéíóúñÁÉÍÓÚÑ]", clean_line))
+                or (clean_line.isupper() and len(clean_line.replace(" ", "")) >= 3)
+            ) and len(clean_line) < 100
+            if is_section_header:
+                if current_content:
+                    chunks.append(_legacy_chunk("\n".join(current_content), current_section, doc))
+                    current_content = []
+                current_section = clean_line
+            else:
+                current_content.append(line)
+        if current_content:
+            chunks.append(_legacy_chunk("\n".join(current_content), current_section, doc))
+    return chunks
+
+
+def _legacy_chunk(content: str, section: str, doc: Document) -> Document:
+    return Document(
+        page_content=content.strip(),
+        metadata={**doc.metadata, "section": section or "No section", "source": doc.metadata.get("source", "unknown")},
+    )
+
+
+def contained(chunks: list[Document]) -> int:
+    """Chunks whose text is wholly inside the chunk before them (pure-overlap duplicates)."""
+    return sum(b.page_content in a.page_content for a, b in zip(chunks, chunks[1:]))
+
+
+def timed(fn, rounds: int) -> tuple[list[float], list[Document]]:
+    samples, result = [], []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--overlap", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = build_manual(args.pages)
+    total_chars = sum(len(d.page_content) for d in docs)
+    print(f"Manual: {args.pages} pages, {total_chars / 1e6:.2f} M chars, "
+          f"chunk_size={args.chunk_size}, overlap={args.overlap}, rounds={args.rounds}")
+
+    recursive = RecursiveCharacterTextSplitter(
+        chunk_size=args.chunk_size, chunk_overlap=args.overlap, length_function=len,
+    )
+    splitter = HierarchicalSplitter()
+
+    def two_stage():
+        return recursive.split_documents(legacy_sections(docs))
+
+    def single_pass():
+        return splitter.split_documents(docs, chunk_size=args.chunk_size, chunk_overlap=args.overlap)
+
+    results, counts, duplicates = {}, {}, {}
+    for name, fn in (("two-stage", two_stage), ("single-pass", single_pass)):
+        samples, chunks = timed(fn, args.rounds)
+        median = statistics.median(samples)
+        sizes = [len(c.page_content) for c in chunks]
+        results[name] = median
+        counts[name] = len(chunks)
+        duplicates[name] = contained(chunks)
+        print(f"{name:>12}: median {median * 1000:8.1f} ms  "
+              f"({total_chars / median / 1e6:6.1f} M chars/s)  "
+              f"chunks={len(chunks)}  contained={duplicates[name]}  "
+              f"avg={statistics.mean(sizes):.0f}  max={max(sizes)}")
+
+    ratio = counts["single-pass"] / counts["two-stage"]
+    print(f"Speedup: {results['two-stage'] / results['single-pass']:.2f}x  "
+          f"chunk count ratio: {ratio:.3f}")
+    # Faster must not mean more chunks to embed and store, nor duplicated overlap
+    assert duplicates["single-pass"] == 0, f"{duplicates['single-pass']} chunks contained in their predecessor"
+    assert ratio <= 1.05, f"single-pass emits {ratio:.1%} of the two-stage chunk count"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Qdrant collection profile benchmark: dense recall@k vs memory.
+
+Builds one scratch collection per profile (memory, int8, binary, disk) through
+QdrantManager — so the exact production collection config is exercised — from
+the same dense vectors, then compares each profile's top-k against an exact
+(brute-force) float32 search. Reports recall@k, query latency and the estimated
+RAM / disk footprint of the dense index.
+
+Vectors come from a real collection (default: settings.qdrant_collection) so
+recall reflects our own embedding distribution; queries are held-out chunks
+removed from the indexed set, or texts from --queries embedded with the
+production Embedder. Without a collection, --synthetic generates clustered
+768-d vectors instead.
+
+Quantization only exists in server Qdrant: run against a real instance.
+
+Usage:
+    uv run python -m scripts.bench_vector_profiles
+    uv run python -m scripts.bench_vector_profiles --source reactive_documents --queries data/queries.txt
+    uv run python -m scripts.bench_vector_profiles --synthetic 50000 --profiles memory,int8,binary
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+from qdrant_client.http import models
+
+from app.persistence.vector import COLLECTION_PROFILES, QdrantManager
+
+DIM = 768
+HNSW_M = 16  # Qdrant default: ~2*m links of 4 bytes per vector on layer 0
+
+
+async def load_vectors(manager: QdrantManager, source: str, max_points: int) -> np.ndarray:
+    vectors, offset = [], None
+    while len(vectors) < max_points:
+        records, offset = await manager.client.scroll(
+            collection_name=source, limit=512, offset=offset, with_payload=False, with_vectors=["dense"]
+        )
+        vectors.extend(r.vector["dense"] for r in records)
+        if offset is None:
+            break
+    return np.asarray(vectors[:max_points], dtype=np.float32)
+
+
+def synthetic_vectors(count: int, clusters: int = 64, seed: int = 5) -> np.ndarray:
+    """Unit vectors around random centroids: closer to real embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(clusters, DIM))
+    vectors = centroids[rng.integers(0, clusters, count)] + 0.6 * rng.normal(size=(count, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+async def embed_queries(path: str) -> np.ndarray:
+    from app.domain.shared.ingestion.embedder import Embedder
+
+    texts = [line.strip() for line in Path(path).read_text(encoding="utf-8").splitlines() if line.strip()]
+    return np.asarray(await Embedder().embed_documents(texts), dtype=np.float32)
+
+
+def footprint_mb(profile, points: int) -> tuple[float, float]:
+    """Estimated (RAM, disk) MB of the dense vectors + HNSW graph for a profile."""
+    full = points * DIM * 4
+    quantized = {"int8": points * DIM, "binary": points * DIM / 8}.get(profile.quantization, 0)
+    graph = points * 2 * HNSW_M * 4
+    ram = quantized + (0 if profile.vectors_on_disk else full) + (0 if profile.hnsw_on_disk else graph)
+    disk = (full if profile.vectors_on_disk else 0) + (graph if profile.hnsw_on_disk else 0)
+    return ram / 1e6, disk / 1e6
+
+
+async def wait_indexed(manager: QdrantManager, timeout: float = 600.0) -> None:
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        info = await manager.client.get_collection(manager.collection_name)
+        if info.status == models.CollectionStatus.GREEN:
+            return
+        await asyncio.sleep(1.0)
+    print(f"  {manager.collection_name}: still optimizing after {timeout:.0f}s, measuring anyway")
+
+
+async def build(name: str, vectors: np.ndarray, batch: int) -> QdrantManager:
+    manager = QdrantManager()
+    manager.collection_name = f"bench_profile_{name}"
+    manager.profile = COLLECTION_PROFILES[name]
+    if await manager.client.collection_exists(manager.collection_name):
+        await manager.client.delete_collection(manager.collection_name)
+        manager._initialized = False  # collection-ready state is process-wide
+    await manager._ensure_collection()
+
+    started = time.perf_counter()
+    for start in range(0, len(vectors), batch):
+        await manager.client.upsert(
+            collection_name=manager.collection_name,
+            points=[
+                models.PointStruct(id=start + i, vector={"dense": v.tolist()}, payload={})
+                for i, v in enumerate(vectors[start:start + batch])
+            ],
+            wait=True,
+        )
+    await wait_indexed(manager)
+    print(f"  {name}: {len(vectors)} points indexed in {time.perf_counter() - started:.1f}s")
+    return manager
+
+
+async def top_k(manager: QdrantManager, query: np.ndarray, k: int, params) -> list:
+    result = await manager.client.query_points(
+        collection_name=manager.collection_name, query=query.tolist(), using="dense",
+        limit=k, search_params=params, with_payload=False,
+    )
+    return [p.id for p in result.points]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=None, help="Collection to read dense vectors from (default: settings.qdrant_collection)")
+    parser.add_argument("--max-points", type=int, default=100_000)
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic vectors instead of a collection")
+    parser.add_argument("--queries", default=None, help="Text file, one query per line (embedded with the Embedder)")
+    parser.add_argument("--num-queries", type=int, default=200, help="Held-out queries when --queries is not given")
+    parser.add_argument("--profiles", default=",".join(COLLECTION_PROFILES))
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--keep", action="store_true", help="Keep the bench_profile_* collections")
+    parser.add_argument("--json", default=None, help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    reader = QdrantManager()
+    if args.synthetic:
+        vectors = synthetic_vectors(args.synthetic)
+    else:
+        vectors = await load_vectors(reader, args.source or reader.collection_name, args.max_points)
+    if args.queries:
+        queries = await embed_queries(args.queries)
+    else:
+        # Held-out chunks: removed from the index so no query finds itself
+        rng = np.random.default_rng(0)
+        held_out = rng.choice(len(vectors), size=min(args.num_queries, len(vectors) // 10), replace=False)
+        queries = vectors[held_out]
+        vectors = np.delete(vectors, held_out, axis=0)
+    if not len(vectors) or not len(queries):
+        raise SystemExit("No vectors / queries to benchmark with")
+    print(f"{len(vectors)} points, {len(queries)} queries, k={args.k}")
+
+    names = [n.strip() for n in args.profiles.split(",") if n.strip()]
+    managers = {name: await build(name, vectors, args.batch) for name in names}
+
+    # Ground truth: exhaustive float32 search
+    reference = next(iter(managers.values()))
+    exact = models.SearchParams(exact=True, quantization=models.QuantizationSearchParams(ignore=True))
+    truth = [set(await top_k(reference, q, args.k, exact)) for q in queries]
+
+    report = {}
+    print(f"\n{'profile':<9}{'recall@k':>10}{'p50 ms':>9}{'p95 ms':>9}{'RAM MB':>10}{'disk MB':>10}")
+    for name, manager in managers.items():
+        params = manager.dense_search_params()
+        latencies, recalls = [], []
+        for query, expected in zip(queries, truth):
+            started = time.perf_counter()
+            found = await top_k(manager, query, args.k, params)
+            latencies.append(time.perf_counter() - started)
+            recalls.append(len(expected.intersection(found)) / len(expected) if expected else 1.0)
+        ram, disk = footprint_mb(manager.profile, len(vectors))
+        report[name] = {
+            "recall_at_k": round(statistics.mean(recalls), 4),
+            "p50_ms": round(statistics.median(latencies) * 1000, 2),
+            "p95_ms": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))] * 1000, 2),
+            "ram_mb_est": round(ram, 1),
+            "disk_mb_est": round(disk, 1),
+        }
+        row = report[name]
+        print(f"{name:<9}{row['recall_at_k']:>10}{row['p50_ms']:>9}{row['p95_ms']:>9}"
+              f"{row['ram_mb_est']:>10}{row['disk_mb_est']:>10}")
+
+    if not args.keep:
+        for manager in managers.values():
+            await manager.client.delete_collection(manager.collection_name)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "profiles": report}, indent=2))
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Export the cross-encoder reranker to ONNX and quantize it to int8.
+
+Writes into --out (default: settings.reranker_onnx_dir):
+    model.onnx (+ external weight data)  fp32 export    -> reranker_backend=onnx
+    model_int8.onnx                      dynamic int8   -> reranker_backend=onnx-int8
+    tokenizer.json                       fast tokenizer used by OnnxCrossEncoder
+
+Usage:
+    uv run python -m scripts.export_reranker_onnx [--model BAAI/bge-reranker-v2-m3] [--out DIR]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.domain.shared.retrieval.onnx_reranker import FP32_FILE, INT8_FILE
+
+
+def export(model_name: str, out: Path, opset: int) -> Path:
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    tokenizer.save_pretrained(out)  # tokenizer.json is what OnnxCrossEncoder reads
+
+    sample = tokenizer([["query", "passage"]], return_tensors="pt")
+    path = out / FP32_FILE
+    with torch.no_grad():
+        # Models over 2 GB are written with external data next to model.onnx
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            str(path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=opset,
+        )
+    return path
+
+
+def quantize(fp32_path: Path, out: Path) -> Path:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    path = out / INT8_FILE
+    # Dynamic quantization: int8 weights for MatMul/Gemm, activations quantized at run time
+    quantize_dynamic(
+        model_input=str(fp32_path),
+        model_output=str(path),
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=["MatMul", "Gemm"],
+    )
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.reranker_model)
+    parser.add_argument("--out", default=settings.reranker_onnx_dir)
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--skip-quantize", action="store_true")
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    fp32_path = export(args.model, out, args.opset)
+    print(f"fp32 export: {fp32_path} ({time.perf_counter() - started:.0f}s)")
+
+    if not args.skip_quantize:
+        started = time.perf_counter()
+        int8_path = quantize(fp32_path, out)
+        size_mb = int8_path.stat().st_size / 1e6
+        print(f"int8 model:  {int8_path} ({size_mb:.0f} MB, {time.perf_counter() - started:.0f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Create the keyword payload indexes on existing Qdrant collections.
+
+Collections created before payload indexes existed only get them (in the
+background) the first time the app touches them. This applies them up front,
+waiting for each index to finish building, for both the proactive and the
+reactive collection. With QDRANT_TENANT_PARTITIONING=true it also rebuilds the
+tenant index with `is_tenant` and switches HNSW to per-tenant graphs.
+
+--apply-profile also moves each collection to QDRANT_COLLECTION_PROFILE
+(quantization, on-disk vectors / HNSW / sparse index); Qdrant re-optimizes the
+segments in the background.
+
+Usage:
+    uv run python -m scripts.migrate_qdrant_indexes [--dry-run] [--apply-profile]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.persistence.reactiva.reactive_vector import ReactiveQdrantManager
+from app.persistence.vector import QdrantManager
+
+
+async def migrate(manager: QdrantManager, dry_run: bool, apply_profile: bool) -> None:
+    name = manager.collection_name
+    if not await manager.client.collection_exists(name):
+        print(f"{name}: does not exist, skipped (indexes are created with the collection)")
+        return
+
+    info = await manager.client.get_collection(name)
+    indexed = info.payload_schema or {}
+    print(f"{name}: {info.points_count} points, indexed fields: {sorted(indexed) or '-'}")
+    if dry_run:
+        fields = (*manager.keyword_index_fields, *manager.integer_index_fields)
+        missing = [f for f in fields if f not in indexed]
+        print(f"{name}: would create {missing or 'nothing'}")
+        if apply_profile:
+            print(f"{name}: would apply profile '{manager.profile.name}'")
+        return
+
+    started = time.perf_counter()
+    changed = await manager.ensure_payload_indexes(wait=True)
+    print(f"{name}: {'updated ' + ', '.join(changed) if changed else 'up to date'} "
+          f"({time.perf_counter() - started:.1f}s)")
+    if apply_profile:
+        await manager.apply_collection_profile()
+        print(f"{name}: profile '{manager.profile.name}' applied (optimizing in the background)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Only report what is missing")
+    parser.add_argument("--apply-profile", action="store_true", help="Also apply QDRANT_COLLECTION_PROFILE")
+    args = parser.parse_args()
+
+    print(f"Qdrant {settings.qdrant_host}:{settings.qdrant_port} "
+          f"(tenant partitioning: {settings.qdrant_tenant_partitioning}, profile: {settings.qdrant_collection_profile})")
+    for manager in (QdrantManager(), ReactiveQdrantManager()):
+        await migrate(manager, args.dry_run, args.apply_profile)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
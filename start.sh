@@ -32,6 +32,13 @@ touch /root/.Xauthority
 xauth generate :99 . trusted 2>/dev/null || true
 echo "[start.sh] ~/.Xauthority inicializado."
 
+# Servidor de inferencia local opcional (embeddings + rerank fuera del proceso de la API).
+# Escucha en INFERENCE_SERVER_URL; la API lo usa cuando esa variable está definida.
+if [ "${INFERENCE_SERVER_LAUNCH:-false}" = "true" ]; then
+    echo "[start.sh] Iniciando servidor de inferencia en ${INFERENCE_SERVER_URL}..."
+    uv run python -m app.domain.shared.inference.server &
+fi
+
 echo "[start.sh] Iniciando uvicorn..."
 
 # Ejecutar uvicorn en foreground (reemplaza este proceso)